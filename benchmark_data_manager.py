@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+NFL Data Manager Benchmarks - Reproducible timings for cache load paths and formats
+Generates synthetic weekly/PBP frames, so no network access is needed
+
+Example:
+    python benchmark_data_manager.py --seasons 5 --rows 50000 --output benchmark_results.json
+    python benchmark_data_manager.py --startup-only --startup-budget 0.25
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+from lazy_imports import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+BACKENDS = ['parquet', 'arrow', 'pickle']
+DATASETS = ['weekly', 'pbp']
+
+# Narrow column set used for the projected-read measurement
+PROJECTED_COLUMNS = {
+    'weekly': ['season', 'week', 'player_id', 'passing_yards', 'passing_epa'],
+    'pbp': ['game_id', 'week', 'passer_player_id', 'epa', 'air_yards'],
+}
+
+# Entry-point modules that must import quickly and without heavy dependencies
+STARTUP_MODULES = ['nfl_data_manager', 'session_manager']
+HEAVY_MODULES = ['pandas', 'pyarrow', 'nfl_data_py', 'sklearn']
+
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB',
+         'HOU', 'IND', 'JAX', 'KC', 'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+         'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS']
+
+def make_weekly_frame(season, rows, extra_columns=0, seed=0):
+    """Build a synthetic weekly player-stats frame shaped like nfl_data_py's"""
+    rng = np.random.default_rng(seed + season)
+    players = np.array([f"00-00{i:05d}" for i in range(max(rows // 18, 1))])
+    player_index = rng.integers(0, len(players), rows)
+
+    frame = pd.DataFrame({
+        'player_id': players[player_index],
+        'player_name': [f"P.Player{i}" for i in player_index],
+        'position': rng.choice(['QB', 'RB', 'WR', 'TE'], rows, p=[0.1, 0.3, 0.4, 0.2]),
+        'recent_team': rng.choice(TEAMS, rows),
+        'season': season,
+        'week': rng.integers(1, 19, rows),
+        'season_type': 'REG',
+        'completions': rng.integers(0, 35, rows).astype(float),
+        'attempts': rng.integers(0, 50, rows).astype(float),
+        'passing_yards': rng.integers(0, 450, rows).astype(float),
+        'passing_tds': rng.integers(0, 5, rows).astype(float),
+        'interceptions': rng.integers(0, 4, rows).astype(float),
+        'sacks': rng.integers(0, 6, rows).astype(float),
+        'passing_air_yards': rng.integers(0, 350, rows).astype(float),
+        'passing_epa': rng.normal(0, 6, rows),
+        'qb_rating': rng.uniform(40, 150, rows),
+    })
+    for i in range(extra_columns):
+        frame[f"extra_{i}"] = rng.normal(0, 1, rows)
+    return frame
+
+def make_pbp_frame(season, rows, extra_columns=0, seed=0):
+    """Build a synthetic play-by-play frame; extra_columns widens it toward real PBP (~370 columns)"""
+    rng = np.random.default_rng(seed + season)
+    plays_per_game = 160
+    game_number = np.arange(rows) // plays_per_game
+    week = np.minimum(game_number // 16 + 1, 18)
+
+    frame = pd.DataFrame({
+        'game_id': [f"{season}_{w:02d}_G{g:03d}" for w, g in zip(week, game_number)],
+        'play_id': np.arange(rows),
+        'season': season,
+        'week': week,
+        'season_type': 'REG',
+        'posteam': rng.choice(TEAMS, rows),
+        'defteam': rng.choice(TEAMS, rows),
+        'play_type': rng.choice(['pass', 'run', 'punt', 'field_goal', 'no_play'], rows),
+        'passer_player_id': rng.choice([f"00-00{i:05d}" for i in range(80)] + [None], rows),
+        'down': rng.integers(1, 5, rows).astype(float),
+        'ydstogo': rng.integers(1, 20, rows).astype(float),
+        'epa': rng.normal(0, 1.5, rows),
+        'air_yards': rng.integers(-5, 50, rows).astype(float),
+        'qb_dropback': rng.integers(0, 2, rows).astype(float),
+        'pass_attempt': rng.integers(0, 2, rows).astype(float),
+    })
+    for i in range(extra_columns):
+        frame[f"extra_{i}"] = rng.normal(0, 1, rows)
+    return frame
+
+FRAME_BUILDERS = {'weekly': make_weekly_frame, 'pbp': make_pbp_frame}
+
+def synthetic_loader(dataset, rows, extra_columns, delay=0.0):
+    """Return a stand-in for the nfl_data_py import function of a dataset"""
+    def load(years):
+        if delay:
+            time.sleep(delay * len(years))
+        return pd.concat(
+            [FRAME_BUILDERS[dataset](year, rows, extra_columns) for year in years],
+            ignore_index=True,
+        )
+    return load
+
+def best_time(func, repeat):
+    """Return the fastest of repeat wall-clock timings of func()"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def directory_bytes(path):
+    """Total size of all files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _bench_manager(backend, dataset, seasons, rows, extra_columns, repeat, cache_dir):
+    """Measure NFLDataManager load paths for one cache format"""
+    from nfl_data_manager import NFLDataManager
+
+    loaders = {dataset: synthetic_loader(dataset, rows, extra_columns)}
+    get = lambda dm, **kwargs: getattr(dm, f"get_{dataset}_data")(seasons, **kwargs)
+
+    disk = NFLDataManager(cache_dir, loaders=loaders, cache_format=backend, memory_cache_bytes=0)
+    start = time.perf_counter()
+    rows_loaded = len(get(disk))
+    cold = time.perf_counter() - start
+
+    memory = NFLDataManager(cache_dir, loaders=loaders, cache_format=backend,
+                            memory_cache_bytes=8 * 1024 ** 3)
+    get(memory)
+
+    return {
+        'rows': rows_loaded,
+        'cold_fetch_s': cold,
+        'warm_disk_s': best_time(lambda: get(disk), repeat),
+        'memory_hit_s': best_time(lambda: get(memory), repeat),
+        'projected_read_s': best_time(lambda: get(disk, columns=PROJECTED_COLUMNS[dataset]), repeat),
+        'filtered_read_s': best_time(lambda: get(disk, weeks=(1, 4)), repeat),
+        'memory_stats': memory.memory_cache_stats(),
+    }
+
+def _bench_pickle(dataset, seasons, rows, extra_columns, repeat, cache_dir):
+    """Measure the original single-pickle-per-range cache as a baseline"""
+    loader = synthetic_loader(dataset, rows, extra_columns)
+    path = os.path.join(cache_dir, f"{dataset}_{min(seasons)}-{max(seasons)}.pkl")
+
+    def load():
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    start = time.perf_counter()
+    data = loader(seasons)
+    with open(path, 'wb') as f:
+        pickle.dump(data, f)
+    cold = time.perf_counter() - start
+
+    return {
+        'rows': len(data),
+        'cold_fetch_s': cold,
+        'warm_disk_s': best_time(load, repeat),
+        'memory_hit_s': None,
+        'projected_read_s': best_time(lambda: load()[PROJECTED_COLUMNS[dataset]], repeat),
+        'filtered_read_s': best_time(lambda: (lambda d: d[d['week'] <= 4])(load()), repeat),
+    }
+
+def run_case(backend, dataset, seasons, rows, extra_columns, repeat):
+    """Run one backend/dataset case in the current process and return its results"""
+    cache_dir = tempfile.mkdtemp(prefix=f"bench_{backend}_{dataset}_")
+    try:
+        if backend == 'pickle':
+            result = _bench_pickle(dataset, seasons, rows, extra_columns, repeat, cache_dir)
+        else:
+            result = _bench_manager(backend, dataset, seasons, rows, extra_columns, repeat, cache_dir)
+        result['disk_bytes'] = directory_bytes(cache_dir)
+        result['peak_rss_mb'] = peak_rss_mb()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    result.update({'backend': backend, 'dataset': dataset})
+    return result
+
+def measure_import_time(module, repeat=5):
+    """Fastest import time of module in a fresh interpreter, plus any heavy modules it pulled in"""
+    code = (
+        "import sys, time, json; start = time.perf_counter(); "
+        f"import {module}; elapsed = time.perf_counter() - start; "
+        f"print(json.dumps([elapsed, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))"
+    )
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_dir, os.environ.get('PYTHONPATH')])))
+
+    timings = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=repo_dir, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        elapsed, heavy = json.loads(output.strip().splitlines()[-1])
+        timings.append(elapsed)
+    return {'module': module, 'import_s': min(timings), 'heavy_imports': heavy}
+
+def check_startup_budget(budget_s, repeat=5):
+    """Measure entry-point import times and flag any over budget or importing heavy packages"""
+    results = []
+    for module in STARTUP_MODULES:
+        result = measure_import_time(module, repeat)
+        result['budget_s'] = budget_s
+        result['ok'] = result['import_s'] <= budget_s and not result['heavy_imports']
+        status = "✅" if result['ok'] else "❌"
+        heavy = f", imports {', '.join(result['heavy_imports'])}" if result['heavy_imports'] else ""
+        print(f"{status} import {module}: {result['import_s'] * 1000:.1f} ms (budget {budget_s * 1000:.0f} ms{heavy})")
+        results.append(result)
+    return results
+
+def run_benchmarks(backends=BACKENDS, datasets=DATASETS, seasons=3, rows=20_000,
+                   extra_columns=0, repeat=3):
+    """Run every case in its own fresh process so peak RSS is per case"""
+    season_list = list(range(2024 - seasons + 1, 2025))
+    results = []
+
+    for dataset in datasets:
+        for backend in backends:
+            print(f"⏱️  {dataset} / {backend}...")
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                result = pool.submit(run_case, backend, dataset, season_list, rows,
+                                     extra_columns, repeat).result()
+            results.append(result)
+            print(f"   cold {result['cold_fetch_s']:.3f}s, warm {result['warm_disk_s']:.3f}s, "
+                  f"projected {result['projected_read_s']:.3f}s, "
+                  f"disk {result['disk_bytes'] / 1024 ** 2:.1f} MB, peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'pyarrow': __import__('pyarrow').__version__,
+        'config': {
+            'seasons': season_list,
+            'rows_per_season': rows,
+            'extra_columns': extra_columns,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark NFLDataManager cache load paths")
+    parser.add_argument('--backends', nargs='+', default=BACKENDS, choices=BACKENDS)
+    parser.add_argument('--datasets', nargs='+', default=DATASETS, choices=DATASETS)
+    parser.add_argument('--seasons', type=int, default=3, help="Number of synthetic seasons")
+    parser.add_argument('--rows', type=int, default=20_000, help="Rows per synthetic season")
+    parser.add_argument('--extra-columns', type=int, default=0,
+                        help="Filler numeric columns to widen frames (real PBP has ~370 columns)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed repetitions per measurement")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--startup-budget', type=float, default=0.25,
+                        help="Max seconds to import each CLI entry-point module")
+    parser.add_argument('--startup-only', action='store_true',
+                        help="Only run the start-up import budget check")
+    args = parser.parse_args(argv)
+
+    print("🏈 NFL Data Manager Benchmarks")
+    print("=" * 50)
+
+    print("\n🚀 Start-up import budget")
+    startup = check_startup_budget(args.startup_budget)
+    startup_ok = all(result['ok'] for result in startup)
+    if args.startup_only:
+        return 0 if startup_ok else 1
+
+    print()
+    report = run_benchmarks(args.backends, args.datasets, args.seasons, args.rows,
+                            args.extra_columns, args.repeat)
+    report['startup'] = startup
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n💾 Results written to: {args.output}")
+    return 0 if startup_ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
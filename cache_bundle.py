@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Cache Bundles - Pack cache partitions into one zstd-compressed archive and unpack them elsewhere
+Used by NFLDataManager.export_bundle / import_bundle to move a cache between codespaces
+"""
+
+import io
+import json
+import os
+import posixpath
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from cache_manifest import atomic_write, file_checksum
+from instrumentation import logger
+
+BUNDLE_MANIFEST = 'bundle_manifest.json'
+BUNDLE_VERSION = 1
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Cache bundles need the zstandard package: pip install zstandard")
+    return zstandard
+
+def _select_entries(manifest, datasets=None, seasons=None):
+    """Return manifest entries filtered by dataset names and seasons"""
+    datasets = set(datasets) if datasets else None
+    seasons = set(seasons) if seasons else None
+    return [
+        entry for _, entry in sorted(manifest.entries().items())
+        if (datasets is None or entry['data_type'] in datasets)
+        and (seasons is None or entry['season'] in seasons)
+    ]
+
+def export_bundle(manager, path, datasets=None, seasons=None, level=10, threads=-1):
+    """Write the selected cache partitions and their manifest entries to a .tar.zst bundle
+
+    Compression runs on threads worker threads (-1 uses every core). The
+    bundle manifest is stored first so imports can plan before any data arrives.
+    """
+    zstandard = _zstd()
+    entries = _select_entries(manager.manifest, datasets, seasons)
+    if not entries:
+        raise ValueError("No cached partitions match the requested datasets/seasons")
+
+    bundle_manifest = {
+        'version': BUNDLE_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'entries': entries,
+    }
+    manifest_bytes = json.dumps(bundle_manifest, indent=2, sort_keys=True).encode()
+
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    total_bytes = 0
+    with atomic_write(path) as raw:
+        with compressor.stream_writer(raw, closefd=False) as compressed:
+            with tarfile.open(fileobj=compressed, mode='w|') as tar:
+                info = tarfile.TarInfo(BUNDLE_MANIFEST)
+                info.size = len(manifest_bytes)
+                tar.addfile(info, io.BytesIO(manifest_bytes))
+
+                for entry in entries:
+                    source = os.path.join(manager.data_dir, entry['path'])
+                    tar.add(source, arcname=entry['path'].replace(os.sep, '/'), recursive=False)
+                    total_bytes += entry['bytes']
+
+    logger.info(f"📦 Exported {len(entries)} partitions ({total_bytes / 1024 ** 2:.1f} MB raw, "
+                f"{os.path.getsize(path) / 1024 ** 2:.1f} MB compressed) to: {path}")
+    return {'partitions': len(entries), 'raw_bytes': total_bytes, 'bundle_bytes': os.path.getsize(path)}
+
+def _safe_member_path(name):
+    """Reject absolute or parent-relative archive paths"""
+    normalized = posixpath.normpath(name)
+    if normalized.startswith(('/', '../')) or normalized == '..':
+        raise ValueError(f"Unsafe path in bundle: {name}")
+    return normalized
+
+def _verify_and_commit(manager, entry, tmp_path):
+    """Check a staged partition against its checksum and move it into the cache"""
+    try:
+        if file_checksum(tmp_path) != entry['checksum']:
+            raise ValueError(f"checksum mismatch for {entry['path']}")
+        target = os.path.join(manager.data_dir, entry['path'])
+        with manager.manifest.lock:
+            previous = manager.manifest.get(entry['data_type'], entry['season'])
+            os.replace(tmp_path, target)
+            manager.manifest.update(entry)
+            # A partition replaced from another format would otherwise stay behind untracked
+            if previous and previous['path'] != entry['path']:
+                stale = os.path.join(manager.data_dir, previous['path'])
+                if os.path.exists(stale):
+                    os.remove(stale)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def import_bundle(manager, path, overwrite=False, workers=4):
+    """Stream-extract a bundle into the cache, verifying partitions in parallel
+
+    Partitions already cached with an identical checksum are skipped without
+    being written, as are partitions in a different format from the cache's.
+    Each extracted file is staged next to its target and only renamed into
+    place (with its manifest entry) once its checksum verifies.
+    """
+    zstandard = _zstd()
+    report = {'imported': [], 'skipped': [], 'failed': {}}
+    futures = {}
+
+    with open(path, 'rb') as raw, ThreadPoolExecutor(max_workers=workers) as pool:
+        reader = zstandard.ZstdDecompressor().stream_reader(raw)
+        with tarfile.open(fileobj=reader, mode='r|') as tar:
+            entries = None
+            for member in tar:
+                if member.name == BUNDLE_MANIFEST:
+                    bundle_manifest = json.load(tar.extractfile(member))
+                    entries = {entry['path'].replace(os.sep, '/'): entry for entry in bundle_manifest['entries']}
+                    continue
+                if entries is None:
+                    raise ValueError(f"{path} is not a cache bundle (missing {BUNDLE_MANIFEST})")
+
+                name = _safe_member_path(member.name)
+                entry = entries.get(name)
+                if entry is None or not member.isfile():
+                    logger.warning(f"⚠️  Ignoring unexpected bundle member: {member.name}")
+                    continue
+                key = (entry['data_type'], entry['season'])
+                if entry['format'] != manager.cache_format:
+                    report['skipped'].append(key)
+                    logger.warning(f"⚠️  Skipping {entry['path']}: bundle partition is {entry['format']}, "
+                                   f"this cache stores {manager.cache_format}")
+                    continue
+
+                local = manager.manifest.get(entry['data_type'], entry['season'])
+                has_local = (local is not None and local['format'] == manager.cache_format
+                             and os.path.exists(os.path.join(manager.data_dir, local['path'])))
+                if has_local and local['checksum'] == entry['checksum']:
+                    report['skipped'].append(key)
+                    continue
+                if has_local and not overwrite:
+                    report['skipped'].append(key)
+                    logger.info(f"⏭️  Keeping local {local['path']} (differs from bundle; use overwrite=True)")
+                    continue
+
+                target = os.path.join(manager.data_dir, entry['path'])
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.tmp-')
+                with os.fdopen(fd, 'wb') as out:
+                    source = tar.extractfile(member)
+                    for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                        out.write(chunk)
+                futures[pool.submit(_verify_and_commit, manager, entry, tmp_path)] = key
+
+        for future, key in futures.items():
+            error = future.exception()
+            if error is None:
+                report['imported'].append(key)
+            else:
+                report['failed'][key] = error
+                logger.error(f"❌ Failed to import {key[0]} {key[1]}: {error}")
+
+    logger.info(f"📥 Imported {len(report['imported'])} partitions, skipped {len(report['skipped'])}, "
+                f"failed {len(report['failed'])}")
+    return report
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Cache Manifest - Bookkeeping for the NFLDataManager partition cache
+Records what each cached partition holds so lookups never have to open data files
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.cache.lock'
+MANIFEST_VERSION = 1
+
+# Reads refresh an entry's last_access at most this often, so hot loops do not rewrite the manifest
+ACCESS_RESOLUTION_SECONDS = 3600
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def schema_hash(schema):
+    """Return a short stable hash of a pyarrow schema's column names and types"""
+    description = ';'.join(f"{field.name}:{field.type}" for field in schema)
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+def unify_schemas(schemas):
+    """Merge season partition schemas into one, widening dtypes that differ between seasons
+
+    pyarrow will not promote every pair of types: a season where a string
+    column is entirely missing is written by pandas as double, which does
+    not unify with string or dictionary. Such fields fall back to string.
+    """
+    import pyarrow as pa
+
+    try:
+        return pa.unify_schemas(schemas, promote_options='permissive')
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+    fields = []
+    for name, field_types in types.items():
+        try:
+            field = pa.unify_schemas([pa.schema([(name, field_type)]) for field_type in field_types],
+                                     promote_options='permissive').field(name)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            field = pa.field(name, pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+def conform_table(table, schema):
+    """Cast the columns of a table whose types differ from a unified schema"""
+    for i, field in enumerate(table.schema):
+        target = schema.field(field.name).type
+        if field.type != target:
+            table = table.set_column(i, field.name, table.column(i).cast(target))
+    return table
+
+@contextmanager
+def atomic_write(path, mode='wb'):
+    """Write to a temp file next to path and rename it into place on success
+
+    Readers only ever see the old file or the complete new one.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared by threads and processes on one host
+
+    Re-entrant within a thread. All FileLock objects for the same path share one
+    OS-level lock, so nesting two of them in one thread cannot self-deadlock.
+    """
+
+    _states = {}
+    _states_guard = threading.Lock()
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        with FileLock._states_guard:
+            self._state = FileLock._states.setdefault(
+                self.path, {'lock': threading.RLock(), 'depth': 0, 'handle': None}
+            )
+
+    def __enter__(self):
+        state = self._state
+        state['lock'].acquire()
+        state['depth'] += 1
+        if state['depth'] == 1:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            state['handle'] = open(self.path, 'a+')
+            if fcntl is not None:
+                fcntl.flock(state['handle'].fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        state = self._state
+        state['depth'] -= 1
+        if state['depth'] == 0:
+            if fcntl is not None:
+                fcntl.flock(state['handle'].fileno(), fcntl.LOCK_UN)
+            state['handle'].close()
+            state['handle'] = None
+        state['lock'].release()
+        return False
+
+class CacheManifest:
+    """JSON manifest of cached partitions, keyed by '<data_type>/<season>'
+
+    Each entry records the partition's path, format, columns, row count,
+    schema hash, source version, checksum, size and write time. Updates are
+    read-modify-write under the cache lock and land via atomic rename.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, MANIFEST_NAME)
+        self.lock = FileLock(os.path.join(data_dir, LOCK_NAME))
+        self._entries = {}
+        self._loaded_stamp = None
+        self._guard = threading.Lock()
+
+    @staticmethod
+    def key(data_type, season):
+        """Return the manifest key for one partition"""
+        return f"{data_type}/{season}"
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _reload(self):
+        """Re-read the manifest if another writer replaced it since the last load"""
+        stamp = self._stamp()
+        with self._guard:
+            if stamp == self._loaded_stamp:
+                return self._entries
+            if stamp is None:
+                entries = {}
+            else:
+                with open(self.path) as f:
+                    entries = json.load(f).get('entries', {})
+            self._entries = entries
+            self._loaded_stamp = stamp
+            return entries
+
+    def _save(self, entries):
+        with atomic_write(self.path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+        with self._guard:
+            self._entries = entries
+            self._loaded_stamp = self._stamp()
+
+    def entries(self):
+        """Return a snapshot of all manifest entries"""
+        return dict(self._reload())
+
+    def get(self, data_type, season):
+        """Return the entry for one partition, or None if it is not cached"""
+        return self._reload().get(self.key(data_type, season))
+
+    def update(self, entry):
+        """Insert or replace one partition's entry"""
+        with self.lock:
+            entries = dict(self._reload())
+            entries[self.key(entry['data_type'], entry['season'])] = entry
+            self._save(entries)
+
+    def remove(self, keys):
+        """Drop entries by key"""
+        with self.lock:
+            entries = dict(self._reload())
+            for key in keys:
+                entries.pop(key, None)
+            self._save(entries)
+
+    def touch(self, keys, when=None):
+        """Record an access to the given entries, skipping ones touched within ACCESS_RESOLUTION_SECONDS"""
+        when = when or datetime.now()
+
+        def is_due(entry):
+            last = entry.get('last_access') or entry['written_at']
+            return (when - datetime.fromisoformat(last)).total_seconds() >= ACCESS_RESOLUTION_SECONDS
+
+        current = self._reload()
+        if not any(key in current and is_due(current[key]) for key in keys):
+            return
+        with self.lock:
+            entries = dict(self._reload())
+            for key in keys:
+                if key in entries and is_due(entries[key]):
+                    entries[key] = {**entries[key], 'last_access': when.isoformat(timespec='seconds')}
+            self._save(entries)
+
+    def make_entry(self, data_type, season, path, cache_format, schema, rows, source_version,
+                   checksum, size, **extra):
+        """Build a manifest entry for a partition file about to be renamed into path"""
+        entry = {
+            'data_type': data_type,
+            'season': season,
+            'path': os.path.relpath(path, self.data_dir),
+            'format': cache_format,
+            'columns': schema.names,
+            'rows': rows,
+            'schema_hash': schema_hash(schema),
+            'source_version': source_version,
+            'checksum': checksum,
+            'bytes': size,
+            'written_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        entry.update(extra)
+        return entry
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cache Query - Run SQL over the cached season partitions with DuckDB
+Used by NFLDataManager.query; each cached dataset is exposed as a table of the same name
+"""
+
+import re
+
+import pyarrow.dataset as ds
+
+from cache_manifest import unify_schemas
+from instrumentation import logger
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("SQL queries need the duckdb package: pip install duckdb")
+    return duckdb
+
+def referenced_datasets(sql, datasets):
+    """Return the dataset names that appear as words in a SQL string"""
+    return [name for name in datasets if re.search(rf"\b{re.escape(name)}\b", sql, re.IGNORECASE)]
+
+def partition_dataset(manager, data_type):
+    """Return one pyarrow dataset over every cached season of a dataset, or None if none are cached
+
+    Seasons can differ slightly in schema (new upstream columns, widened
+    dtypes, all-missing string columns stored as double), so the dataset
+    uses their unified schema and casts each file to it while scanning.
+    """
+    paths = [manager.get_cache_path(data_type, season) for season in manager.cached_seasons(data_type)]
+    if not paths:
+        return None
+    file_format = 'ipc' if manager.cache_format == 'arrow' else 'parquet'
+    schema = unify_schemas([ds.dataset(path, format=file_format).schema for path in paths])
+    return ds.dataset(paths, format=file_format, schema=schema)
+
+def run_query(manager, sql, params=None, threads=None, as_arrow=False):
+    """Execute sql against the cached datasets it mentions and return the result
+
+    The datasets are scanned lazily, so DuckDB pushes column selection and
+    filters down into the partition files and runs the query on threads
+    worker threads (all cores by default). Only the result is materialized.
+    """
+    duckdb = _duckdb()
+    connection = duckdb.connect()
+    try:
+        if threads:
+            connection.execute(f"SET threads TO {int(threads)}")
+
+        cached = {entry['data_type'] for entry in manager.manifest.entries().values()}
+        for data_type in referenced_datasets(sql, sorted(cached | set(manager.loaders))):
+            dataset = partition_dataset(manager, data_type)
+            if dataset is None:
+                logger.warning(f"⚠️  No cached {data_type} partitions to query; pass years= or warm the cache first")
+            else:
+                connection.register(data_type, dataset)
+
+        result = connection.execute(sql, params or [])
+        return result.fetch_arrow_table() if as_arrow else result.df()
+    finally:
+        connection.close()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Dtype Optimizer - Shrink frames with lossless numeric downcasts and categorical strings
+Used by NFLDataManager(optimize_dtypes=True) before partitions are written to the cache
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from cache_manifest import atomic_write
+
+SCHEMAS_NAME = 'schemas.json'
+SCHEMAS_VERSION = 2
+
+# Narrowest first; a column registered as one of these is only ever widened
+NUMERIC_ORDER = ['int8', 'int16', 'int32', 'int64', 'float32', 'float64']
+
+# String columns become categoricals when they have at most this share of distinct values
+CATEGORY_RATIO = 0.5
+
+def _fits(series, dtype):
+    """Check whether a numeric series converts to dtype without losing any value"""
+    values = series.to_numpy()
+    if dtype.startswith('int'):
+        if series.isna().any():
+            return False
+        if values.dtype.kind == 'f' and not np.all(np.mod(values, 1) == 0):
+            return False
+        info = np.iinfo(dtype)
+        return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+    if dtype == 'float32':
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.array_equal(values.astype('float32').astype(values.dtype), values, equal_nan=True)
+    return True
+
+def infer_dtype(series):
+    """Return the compact dtype for one column, or None to leave it as is"""
+    if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series):
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            return None
+        current = series.dtype.name
+        if current not in NUMERIC_ORDER:
+            return None
+        # Floats stay floats (nfl_data_py's float counts would overflow as int8 in arithmetic)
+        candidates = [dtype for dtype in NUMERIC_ORDER[:NUMERIC_ORDER.index(current) + 1]
+                      if np.dtype(dtype).kind == series.dtype.kind]
+        for dtype in candidates:
+            if _fits(series, dtype):
+                return dtype if dtype != current else None
+        return None
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        values = series.dropna()
+        if len(values) and values.nunique() <= CATEGORY_RATIO * len(series) \
+                and values.map(type).eq(str).all():
+            return 'category'
+    return None
+
+def _wider(first, second):
+    if first == second:
+        return first
+    if first in NUMERIC_ORDER and second in NUMERIC_ORDER:
+        return max(first, second, key=NUMERIC_ORDER.index)
+    return None
+
+def optimize_frame(frame, schema=None):
+    """Downcast a frame, honouring a dataset's registered schema so seasons stay consistent
+
+    Registered dtypes are reused whenever the values fit, and widened (never
+    narrowed) when a season needs more room. Float columns are never made
+    integer, only float32 where every value round-trips exactly. Returns the new frame, the
+    updated schema, and the frame's deep memory size before and after.
+    """
+    schema = dict(schema or {})
+    before = int(frame.memory_usage(deep=True).sum())
+    converted = {}
+
+    for column in frame.columns:
+        series = frame[column]
+        registered = schema.get(column)
+        if registered == 'category':
+            target = 'category'
+        elif registered in NUMERIC_ORDER and (pd.api.types.is_integer_dtype(series)
+                                              or pd.api.types.is_float_dtype(series)) \
+                and not (registered.startswith('int') and pd.api.types.is_float_dtype(series)) \
+                and _fits(series, registered):
+            target = registered
+        else:
+            target = infer_dtype(series)
+            if column in schema:
+                target = _wider(registered, target or series.dtype.name)
+
+        if target is None:
+            schema.pop(column, None)
+        else:
+            schema[column] = target
+            if series.dtype.name != target:
+                converted[column] = series.astype(target)
+
+    if converted:
+        frame = frame.assign(**converted)
+    after = int(frame.memory_usage(deep=True).sum())
+    return frame, schema, before, after
+
+def concat_frames(frames):
+    """Concatenate frames, keeping columns categorical when every frame has them as categoricals
+
+    pd.concat falls back to object for categoricals whose categories differ,
+    which they do between seasons, so categories are unioned first.
+    """
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) > 1:
+        columns = [
+            column for column in frames[0].columns
+            if all(column in frame and isinstance(frame[column].dtype, pd.CategoricalDtype)
+                   for frame in frames)
+        ]
+        for column in columns:
+            categories = union_categoricals([frame[column] for frame in frames]).categories
+            frames = [
+                frame.assign(**{column: frame[column].cat.set_categories(categories)})
+                for frame in frames
+            ]
+    return pd.concat(frames, ignore_index=True)
+
+class SchemaRegistry:
+    """Per-dataset column dtypes chosen by optimize_frame, stored as schemas.json in the cache"""
+
+    def __init__(self, data_dir, lock):
+        self.path = os.path.join(data_dir, SCHEMAS_NAME)
+        self.lock = lock
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            registry = json.load(f)
+        # Version 1 could register float columns as integers; start those datasets over
+        if registry.get('version') != SCHEMAS_VERSION:
+            return {}
+        return registry.get('datasets', {})
+
+    def get(self, data_type):
+        """Return the registered {column: dtype} mapping for a dataset"""
+        return self._load().get(data_type, {})
+
+    def update(self, data_type, schema):
+        """Merge a season's schema into the registry, widening columns another writer registered"""
+        with self.lock:
+            datasets = self._load()
+            current = datasets.get(data_type, {})
+            merged = {**current, **{
+                column: _wider(current[column], dtype) or dtype if column in current else dtype
+                for column, dtype in schema.items()
+            }}
+            if merged == current:
+                return
+            datasets[data_type] = merged
+            with atomic_write(self.path, 'w') as f:
+                json.dump({'version': SCHEMAS_VERSION, 'datasets': datasets}, f, indent=2, sort_keys=True)
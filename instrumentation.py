@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Instrumentation - Timings, row/byte counts and cache events for the data pipeline
+NFLDataManager records into one of these; query it with summary() at the end of a session
+"""
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('nfl_data_manager')
+
+class Instrumentation:
+    """Collects per-stage timing totals and cache hit/miss counters
+
+    Stages used by NFLDataManager: download, serialize, deserialize, filter
+    and merge. Only running totals per stage are kept, so a long-lived
+    process does not grow with every load. Callbacks receive each finished
+    record as a dict, e.g. to forward it to a metrics backend.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = {}
+        self.events = {}
+        self.callbacks = []
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """Call callback(record) for every finished stage and event"""
+        self.callbacks.append(callback)
+
+    def _emit(self, record):
+        with self._lock:
+            if record['stage'] == 'event':
+                self.events[record['name']] = self.events.get(record['name'], 0) + 1
+            else:
+                totals = self.stages.setdefault(record['stage'], {
+                    'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'rows': 0, 'bytes': 0,
+                })
+                totals['calls'] += 1
+                totals['total_s'] += record['seconds']
+                totals['max_s'] = max(totals['max_s'], record['seconds'])
+                totals['rows'] += record['rows']
+                totals['bytes'] += record['bytes']
+        logger.debug("%s", record)
+        for callback in self.callbacks:
+            callback(record)
+
+    @contextmanager
+    def timed(self, stage, **fields):
+        """Time a block; the yielded dict can be filled with rows/bytes before it closes"""
+        record = {'stage': stage, 'rows': 0, 'bytes': 0, **fields}
+        if not self.enabled:
+            yield record
+            return
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._emit(record)
+
+    def instrument(self, stage):
+        """Decorator form of timed() for whole functions"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(stage, function=func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def event(self, name, **fields):
+        """Count a point event such as a memory or disk cache hit/miss"""
+        if self.enabled:
+            self._emit({'stage': 'event', 'name': name, **fields})
+
+    def reset(self):
+        """Forget all stage totals and counters"""
+        with self._lock:
+            self.stages = {}
+            self.events = {}
+
+    def summary(self):
+        """Return a per-stage table of calls, time, rows and bytes (pandas DataFrame)"""
+        import pandas as pd
+
+        columns = ['stage', 'calls', 'total_s', 'mean_s', 'max_s', 'rows', 'mb']
+        with self._lock:
+            rows = [
+                [stage, totals['calls'], totals['total_s'], totals['total_s'] / totals['calls'],
+                 totals['max_s'], totals['rows'], totals['bytes'] / (1024 * 1024)]
+                for stage, totals in self.stages.items()
+            ]
+        table = pd.DataFrame(rows, columns=columns)
+        return table.sort_values('total_s', ascending=False, ignore_index=True)
+
+    def cache_summary(self):
+        """Return cache hit/miss counts keyed by event name"""
+        with self._lock:
+            return dict(self.events)
+
+    def report(self):
+        """Format summary() and the cache counters as a printable block"""
+        lines = ["⏱️  Data Pipeline Timings", "-" * 40]
+        summary = self.summary()
+        lines.append(summary.round(4).to_string(index=False) if len(summary) else "   No stages recorded")
+        events = self.cache_summary()
+        if events:
+            lines.append("")
+            lines.extend(f"   {name}: {count}" for name, count in sorted(events.items()))
+        return "\n".join(lines)
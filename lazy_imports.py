@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports - Defer heavy dependencies until they are actually used
+Keeps status and cache-listing commands fast by not importing pandas/pyarrow/nfl_data_py up front
+"""
+
+import importlib
+import importlib.util
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+def is_available(name):
+    """Check whether a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
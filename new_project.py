@@ -33,95 +33,125 @@ def create_new_project():
 {project_description}
 
 Created: {datetime.now().strftime('%Y-%m-%d')}
+
+Re-running is incremental: each stage's output is saved under data/, keyed by
+its code (and the modules it depends on), parameters and input data, and reused
+while none of those change. Figures are only re-rendered when their code or
+data changed.
 \"\"\"
 
+import logging
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless: figures are written to outputs/, never shown
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 # Import our NFL data utilities
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from nfl_data_manager import NFLDataManager
+from pipeline_stages import Pipeline, RunState, cache_fingerprint, render_figures
+import qb_clustering
+import qb_features
+from qb_clustering import QBClusterModel
+
+# Customize these for your specific analysis; changing one only reruns the stages after it
+YEARS = [2022, 2023, 2024]
+MIN_ATTEMPTS = 200
+N_CLUSTERS = 4
+RESULTS_PATH = 'outputs/{project_name}_results.csv'
 
-def load_data():
+pipeline = Pipeline('data')
+
+@pipeline.stage(depends=[qb_features])
+def load_data(years):
     \"\"\"Load NFL data for analysis\"\"\"
     print("📊 Loading NFL data...")
     
-    dm = NFLDataManager()
-    
-    # Customize these years and columns for your specific analysis
-    years = [2022, 2023, 2024]  # Adjust as needed
+    # Pre-aggregated QB seasons (keyed by player_id), built once and cached
+    qb_seasons = NFLDataManager().get_qb_features(years, level='season')
     
-    weekly_data = dm.get_weekly_data(
-        years=years,
-        columns=[
-            'season', 'week', 'player_name', 'position', 'recent_team',
-            'passing_yards', 'passing_tds', 'interceptions', 'qb_rating',
-            'completions', 'attempts', 'passing_epa'
-        ]
-    )
+    return qb_seasons
+
+@pipeline.stage
+def select_features(data, min_attempts):
+    \"\"\"Pick the QB seasons and stats to analyze\"\"\"
+    print(f"Analyzing {{len(data)}} QB seasons from {{data['season'].min()}}-{{data['season'].max()}}")
     
-    return weekly_data
+    # Example: basic QB stats for starters
+    return data[data['attempts'] >= min_attempts][[
+        'player_id', 'player_name', 'season', 'recent_team',
+        'passing_yards', 'passing_tds', 'interceptions', 'passing_epa',
+        'completion_pct', 'yards_per_attempt', 'air_yards_per_attempt',
+        'td_pct', 'int_pct', 'sack_pct', 'epa_per_play'
+    ]].reset_index(drop=True)
 
-def analyze_data(data):
+@pipeline.stage(depends=[qb_clustering])
+def analyze_data(qb_stats, n_clusters):
     \"\"\"Main analysis function\"\"\"
     print("🔍 Starting analysis...")
     
-    # Filter for QBs (adjust for your position of interest)
-    qb_data = data[data['position'] == 'QB']
-    
-    print(f"Analyzing {{len(qb_data)}} QB records from {{data['season'].min()}}-{{data['season'].max()}}")
-    
     # Add your specific analysis here
-    # Example: basic QB stats
-    qb_stats = qb_data.groupby(['player_name', 'season']).agg({{
-        'passing_yards': 'sum',
-        'passing_tds': 'sum', 
-        'interceptions': 'sum',
-        'qb_rating': 'mean',
-        'passing_epa': 'sum'
-    }}).reset_index()
-    
-    return qb_stats
-
-def create_visualizations(data):
-    \"\"\"Create visualizations\"\"\"
+    # Group QBs by playing style (see qb_clustering.py for k sweeps and saved models)
+    model = QBClusterModel(n_clusters=n_clusters).fit(qb_stats)
+    return model.classify(qb_stats)
+
+def plot_epa_vs_ypa(data):
+    \"\"\"EPA per dropback vs yards per attempt, colored by cluster\"\"\"
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.scatter(data['yards_per_attempt'], data['epa_per_play'], c=data['cluster'], cmap='tab10', alpha=0.7)
+    ax.set_xlabel('Yards per Attempt')
+    ax.set_ylabel('EPA per Dropback')
+    ax.set_title('EPA per Dropback vs Yards per Attempt')
+    return fig
+
+def plot_cluster_profiles(data):
+    \"\"\"Average rate stats of each cluster, shaded by how far they sit from the other clusters\"\"\"
+    stats = ['completion_pct', 'yards_per_attempt', 'td_pct', 'int_pct', 'sack_pct', 'epa_per_play']
+    profile = data.groupby('cluster')[stats].mean()
+    fig, ax = plt.subplots(figsize=(9, 4))
+    sns.heatmap((profile - profile.mean()) / profile.std(), annot=profile.round(2), fmt='g',
+                cmap='coolwarm', center=0, ax=ax)
+    ax.set_title('QB Cluster Profiles')
+    return fig
+
+# Each figure is rendered in its own worker process; add entries here for more plots
+FIGURES = {{
+    '{project_name}_epa_vs_ypa': plot_epa_vs_ypa,
+    '{project_name}_cluster_profiles': plot_cluster_profiles,
+}}
+
+def create_visualizations(data, state, data_fingerprint):
+    \"\"\"Render the figures that are out of date\"\"\"
     print("📈 Creating visualizations...")
-    
-    plt.figure(figsize=(12, 8))
-    
-    # Example visualization - customize for your analysis
-    plt.subplot(2, 2, 1)
-    plt.scatter(data['passing_yards'], data['qb_rating'], alpha=0.7)
-    plt.xlabel('Passing Yards')
-    plt.ylabel('QB Rating')
-    plt.title('QB Rating vs Passing Yards')
-    
-    plt.tight_layout()
-    plt.savefig('outputs/{project_name}_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    render_figures(FIGURES, data, 'outputs', state=state, data_fingerprint=data_fingerprint)
 
 def main():
     \"\"\"Main analysis pipeline\"\"\"
-    print(f"🚀 Starting {{project_name.replace('_', ' ').title()}} Analysis")
+    # Show NFLDataManager cache/download messages (use logging.WARNING for quiet batch runs)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    print("🚀 Starting {project_name.replace('_', ' ').title()} Analysis")
     print("=" * 50)
     
-    # Load data
-    raw_data = load_data()
+    # Load data; downloads any missing seasons first, then reruns only when that data changes
+    data_version = cache_fingerprint(NFLDataManager(), 'weekly', YEARS)
+    raw_data = load_data(years=YEARS, upstream_version=data_version)
     
     # Analyze
-    results = analyze_data(raw_data)
-    
-    # Visualize
-    create_visualizations(results)
+    qb_stats = select_features(raw_data, min_attempts=MIN_ATTEMPTS)
+    results = analyze_data(qb_stats, n_clusters=N_CLUSTERS)
     
-    # Save results
-    results.to_csv('outputs/{project_name}_results.csv', index=False)
+    # Save results and visualize, skipping outputs that are already up to date
+    state = RunState('outputs/.run_state.json')
+    results_version = pipeline.version(results)
+    if not state.is_current('results_csv', results_version, [RESULTS_PATH]):
+        results.to_csv(RESULTS_PATH, index=False)
+        state.record('results_csv', results_version)
+    create_visualizations(results, state, results_version)
     
     print(f"✅ Analysis complete! Results saved to outputs/")
 
@@ -149,6 +179,12 @@ cd {project_dir}
 python analysis.py
 ```
 
+Each stage of `analysis.py` saves its output to `data/` (Parquet), keyed by the
+stage's code (including the `qb_features`/`qb_clustering` modules it uses),
+parameters and input data. Re-runs reuse those outputs and only redo the stages,
+figures and files downstream of what changed. Delete `data/*.parquet` and
+`outputs/.run_state.json` to force a full run.
+
 ## Data Sources
 - NFL weekly statistics (2022-2024)
 - Cached via NFLDataManager for fast loading
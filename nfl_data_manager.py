@@ -4,87 +4,1253 @@ NFL Data Manager - Handles data collection, caching, and persistence
 Use this to collect data once and reuse across sessions
 """
 
+import json
+import logging
 import os
-import pandas as pd
-import pickle
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import nfl_data_py as nfl
+from cache_manifest import CacheManifest, FileLock, conform_table, file_checksum, unify_schemas
+from instrumentation import Instrumentation, logger
+from lazy_imports import LazyModule
+
+# Heavy dependencies load on first use, so listing or clearing the cache stays instant
+asyncio = LazyModule('asyncio')
+pd = LazyModule('pandas')
+pa = LazyModule('pyarrow')
+ds = LazyModule('pyarrow.dataset')
+pq = LazyModule('pyarrow.parquet')
+nfl = LazyModule('nfl_data_py')
+qb_features = LazyModule('qb_features')
+cache_bundle = LazyModule('cache_bundle')
+dtype_optimizer = LazyModule('dtype_optimizer')
+partition_index = LazyModule('partition_index')
+cache_query = LazyModule('cache_query')
+player_crosswalk = LazyModule('player_crosswalk')
+
+# Upstream loaders for each cached dataset, called with a list of seasons
+DATASET_LOADERS = {
+    'weekly': lambda years: nfl.import_weekly_data(years=years),
+    'pbp': lambda years: nfl.import_pbp_data(years=years, include_participation=False),
+    'draft': lambda years: nfl.import_draft_picks(years=years),
+}
+
+DATASET_LABELS = {
+    'weekly': 'weekly',
+    'pbp': 'play-by-play',
+    'draft': 'draft',
+    'qb_season': 'QB season',
+}
+
+# File extension for each supported partition format. 'arrow' stores uncompressed
+# Arrow IPC (Feather v2) files that are opened memory-mapped
+CACHE_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+# Pickles of whole year ranges, {data_type}_{first}-{last}.pkl, written by the cache
+# before it was partitioned by season. They are never read; prune() removes them
+LEGACY_CACHE_SUFFIX = '.pkl'
+
+# Columns indexed to row ranges when a partition is written (see get_player_plays / get_game)
+INDEXED_COLUMNS = {
+    'pbp': ['passer_player_id', 'game_id', 'posteam'],
+}
+
+def parse_seasons(spec):
+    """Expand a season spec: an int, a list of ints, or a 'first-last' range string"""
+    if isinstance(spec, int):
+        return [spec]
+    if isinstance(spec, str):
+        first, _, last = spec.partition('-')
+        return list(range(int(first), int(last or first) + 1))
+    return sorted({int(season) for season in spec})
+
+def load_warm_manifest(source):
+    """Load a warm-cache manifest from a path (JSON or YAML), dict or list
+    
+    The manifest is a list of entries (or a dict with a 'datasets' list) like
+    {"dataset": "weekly", "seasons": "2018-2024", "columns": [...]}.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            if str(source).endswith(('.yml', '.yaml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("Reading YAML manifests requires PyYAML: pip install pyyaml")
+                source = yaml.safe_load(f)
+            else:
+                source = json.load(f)
+    
+    entries = source.get('datasets', []) if isinstance(source, dict) else source
+    for entry in entries:
+        if 'dataset' not in entry or 'seasons' not in entry:
+            raise ValueError(f"Manifest entries need 'dataset' and 'seasons': {entry}")
+    return entries
+
+def current_season(today=None):
+    """Return the NFL season in progress; January-August games belong to the previous year's season"""
+    today = today or datetime.now()
+    return today.year if today.month >= 9 else today.year - 1
+
+# When a dataset's season stops changing, as (years after the season, month); draft classes are
+# final once the April draft is over, everything else the March after the Super Bowl
+SEASON_FINAL = {
+    'draft': (0, 5),
+}
+
+def season_final(season, data_type=None):
+    """Return the date after which a dataset's season no longer changes"""
+    years, month = SEASON_FINAL.get(data_type, (1, 3))
+    return datetime(season + years, month, 1)
+
+# Rows per Parquet row group; smaller groups give filters more to skip
+PARTITION_ROW_GROUP_SIZE = 10_000
+
+def build_filters(position=None, season_type=None, weeks=None, player_ids=None,
+                  player_id_column='player_id', filters=None):
+    """Translate convenience row filters into pyarrow (column, op, value) filter tuples
+    
+    weeks may be a single week, a (first, last) range tuple, or a list of weeks.
+    Extra pyarrow-style tuples can be passed through with filters.
+    """
+    result = list(filters or [])
+    
+    if position is not None:
+        result.append(('position', '==', position))
+    if season_type is not None:
+        result.append(('season_type', '==', season_type))
+    if weeks is not None:
+        if isinstance(weeks, int):
+            result.append(('week', '==', weeks))
+        elif isinstance(weeks, tuple) and len(weeks) == 2:
+            result.append(('week', '>=', weeks[0]))
+            result.append(('week', '<=', weeks[1]))
+        else:
+            result.append(('week', 'in', list(weeks)))
+    if player_ids is not None:
+        result.append((player_id_column, 'in', list(player_ids)))
+    
+    return result
+
+def aggregate_chunks(chunks, by, sum_columns, count_column='plays'):
+    """Fold per-chunk group sums into running totals, e.g. per-QB EPA over iter_pbp chunks
+    
+    Only the partial aggregate is kept between chunks, so memory stays flat
+    however many seasons are streamed.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    total = None
+    
+    for chunk in chunks:
+        grouped = chunk.groupby(by, observed=True)
+        partial = grouped[list(sum_columns)].sum()
+        if count_column:
+            partial[count_column] = grouped.size()
+        total = partial if total is None else total.add(partial, fill_value=0)
+    
+    if total is None:
+        return pd.DataFrame(columns=by + list(sum_columns) + ([count_column] if count_column else []))
+    
+    # add(fill_value=0) turns counts into floats once chunks hold different groups
+    if count_column:
+        total[count_column] = total[count_column].astype('int64')
+    return total.reset_index()
+
+def estimate_frame_bytes(frame, sample=1000):
+    """Estimate a frame's memory footprint without walking every Python object
+    
+    Like memory_usage(deep=True), but the size of the objects in each object
+    column is extrapolated from an evenly spaced sample of at most sample
+    values, so wide string-heavy frames cost a fixed amount to size.
+    """
+    size = int(frame.memory_usage(index=True, deep=False).sum())
+    rows = len(frame)
+    if not rows:
+        return size
+    step = max(rows // sample, 1)
+    for _, column in frame.items():
+        if column.dtype == object:
+            values = column.to_numpy()[::step]
+            size += int(sum(sys.getsizeof(value) for value in values) * rows / len(values))
+    return size
+
+class MemoryCache:
+    """Byte-bounded LRU of loaded frames, sitting in front of the on-disk partitions
+    
+    Each entry remembers a signature of the partitions it was built from and
+    is dropped as soon as that signature no longer matches the disk.
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, signature):
+        """Return the cached frame for key, or None if absent or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] != signature:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, signature, frame, size=None):
+        """Store a frame, evicting least recently used entries to stay within budget
+        
+        size is the frame's footprint in bytes; by default it is estimated with
+        estimate_frame_bytes, since a deep memory_usage walks every string and
+        costs as much as the read.
+        """
+        if size is None:
+            size = estimate_frame_bytes(frame)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (frame, signature, size)
+            self.current_bytes += size
+    
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+    
+    def stats(self):
+        """Return hit/miss/eviction counters and current usage"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
 
 class NFLDataManager:
-    def __init__(self, data_dir='nfl_data_cache'):
-        """Initialize the data manager with a cache directory"""
+    # Partition downloads in flight in this process, shared by every manager on the same cache
+    _flights = {}
+    _flights_guard = threading.Lock()
+    
+    def __init__(self, data_dir='nfl_data_cache', max_workers=4, max_retries=2,
+                 retry_delay=1.0, loaders=None, memory_cache_bytes=512 * 1024 * 1024,
+                 cache_format='parquet', current_max_age_days=1, instrumentation=None,
+                 max_cache_bytes=None, optimize_dtypes=False, async_concurrency=None):
+        """Initialize the data manager with a cache directory
+        
+        Missing seasons are fetched in parallel on a pool of max_workers threads,
+        each retried up to max_retries times. loaders maps a dataset name to a
+        callable taking a list of seasons, replacing the nfl_data_py download.
+        Loaded frames are kept in an in-process LRU of up to memory_cache_bytes
+        (0 disables it). cache_format='arrow' stores partitions as Arrow IPC
+        files that are memory-mapped on read instead of decoded. Seasons cached
+        after they ended never expire; any other partition is refreshed once it
+        is older than current_max_age_days. Stage timings and cache hits are
+        recorded on instrumentation (a fresh Instrumentation by default). With
+        max_cache_bytes set, the disk cache is pruned back under that size
+        after every download (see prune()). optimize_dtypes=True downcasts
+        numeric columns and turns low-cardinality strings into categoricals
+        before writing, with the chosen dtypes kept per dataset in schemas.json.
+        The aget_* coroutines run at most async_concurrency loads at once
+        (max_workers by default).
+        """
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(f"cache_format must be one of {sorted(CACHE_FORMATS)}, got {cache_format!r}")
+        
         self.data_dir = data_dir
+        self.cache_format = cache_format
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.current_max_age_days = current_max_age_days
+        self.max_cache_bytes = max_cache_bytes
+        self.optimize_dtypes = optimize_dtypes
+        self.async_concurrency = async_concurrency or max_workers
+        self._async_states = weakref.WeakKeyDictionary()
+        self.loaders = {**DATASET_LOADERS, **(loaders or {})}
+        self.memory_cache = MemoryCache(memory_cache_bytes)
+        self.manifest = CacheManifest(data_dir)
+        self.instrumentation = instrumentation or Instrumentation()
+        self.schemas = dtype_optimizer.SchemaRegistry(data_dir, self.manifest.lock) if optimize_dtypes else None
         os.makedirs(data_dir, exist_ok=True)
+    
+    @staticmethod
+    def normalize_years(years):
+        """Return the requested seasons as a sorted list of unique ints"""
+        if isinstance(years, int):
+            years = [years]
+        return sorted({int(year) for year in years})
         
-    def get_cache_path(self, data_type, years):
-        """Generate cache file path"""
-        year_str = f"{min(years)}-{max(years)}" if len(years) > 1 else str(years[0])
-        return os.path.join(self.data_dir, f"{data_type}_{year_str}.pkl")
+    def get_cache_path(self, data_type, season):
+        """Generate cache file path for a single season partition"""
+        extension = CACHE_FORMATS[self.cache_format]
+        return os.path.join(self.data_dir, data_type, f"{data_type}_{season}{extension}")
+    
+    def is_cache_valid(self, data_type, season, max_age_days=None):
+        """Check the manifest for a fresh partition of this season in the current format
+        
+        Completed seasons are immutable, so a copy written after season_final()
+        stays valid. Copies of the season in progress expire after max_age_days
+        (current_max_age_days by default), and a copy of an earlier season
+        captured before it ended is refreshed once. A partition whose file has
+        gone missing is never valid, so it is downloaded again.
+        """
+        entry = self.manifest.get(data_type, season)
+        return (entry is not None and entry['format'] == self.cache_format
+                and self.is_entry_fresh(entry, max_age_days) and self._partition_exists(entry))
+    
+    def _partition_exists(self, entry):
+        """Check that a manifest entry's file is still on disk"""
+        return entry is not None and os.path.exists(os.path.join(self.data_dir, entry['path']))
     
-    def is_cache_valid(self, cache_path, max_age_days=7):
-        """Check if cached data is still valid"""
-        if not os.path.exists(cache_path):
+    def is_entry_fresh(self, entry, max_age_days=None):
+        """Apply is_cache_valid's age rules to a manifest entry already in hand, whatever its format"""
+        if entry is None:
+            return False
+        cache_time = datetime.fromisoformat(entry['written_at'])
+        if cache_time >= season_final(entry['season'], entry['data_type']):
+            return True
+        if entry['season'] < current_season():
             return False
         
-        cache_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
+        if max_age_days is None:
+            max_age_days = self.current_max_age_days
         return datetime.now() - cache_time < timedelta(days=max_age_days)
     
-    def get_weekly_data(self, years, force_refresh=False, columns=None):
-        """Get weekly data with caching"""
-        cache_path = self.get_cache_path('weekly', years)
+    def cached_seasons(self, data_type):
+        """Return the seasons of a dataset recorded in the manifest for the current format"""
+        return sorted(
+            entry['season'] for entry in self.manifest.entries().values()
+            if entry['data_type'] == data_type and entry['format'] == self.cache_format
+        )
+    
+    def _source_version(self, data_type):
+        """Describe where a dataset's rows came from, for the manifest"""
+        if data_type not in self.loaders:
+            return 'derived from weekly'
+        if self.loaders[data_type] is not DATASET_LOADERS[data_type]:
+            return 'custom loader'
+        from importlib import metadata
+        try:
+            return f"nfl_data_py {metadata.version('nfl_data_py')}"
+        except metadata.PackageNotFoundError:
+            return 'nfl_data_py unknown'
+    
+    def _write_partition(self, data_type, season, data, extra=None):
+        """Write one season of data to its partition in the configured cache format
         
-        if not force_refresh and self.is_cache_valid(cache_path):
-            print(f"📂 Loading weekly data from cache: {cache_path}")
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+        The file is written to a temp name, checksummed, and renamed into place
+        together with its manifest entry under the cache lock, so concurrent
+        jobs never see a half-written partition.
+        """
+        cache_path = self.get_cache_path(data_type, season)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
         
-        print(f"🌐 Downloading weekly data for years {years}...")
-        data = nfl.import_weekly_data(years=years, columns=columns)
+        # Week-ordered row groups let week filters skip whole row groups on read
+        if 'week' in data.columns:
+            data = data.sort_values('week', kind='stable')
         
-        print(f"💾 Caching data to: {cache_path}")
-        with open(cache_path, 'wb') as f:
-            pickle.dump(data, f)
+        if self.optimize_dtypes:
+            data = self._optimize_frame(data_type, season, data)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix='.tmp-')
+        os.close(fd)
+        try:
+            with self.instrumentation.timed('serialize', data_type=data_type, season=season) as record:
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                if self.cache_format == 'arrow':
+                    # A single record batch keeps every column one contiguous chunk, which
+                    # to_pandas can view without copying; iter_pbp still slices it into batches
+                    with pa.OSFile(tmp_path, 'wb') as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table.combine_chunks())
+                else:
+                    pq.write_table(table, tmp_path, row_group_size=PARTITION_ROW_GROUP_SIZE)
+                record['rows'] = table.num_rows
+                record['bytes'] = os.path.getsize(tmp_path)
+            
+            extra = dict(extra or {})
+            if 'week' in data.columns and len(data):
+                extra['max_week'] = int(data['week'].max())
+            entry = self.manifest.make_entry(
+                data_type, season, cache_path, self.cache_format, table.schema, table.num_rows,
+                self._source_version(data_type), checksum=file_checksum(tmp_path),
+                size=os.path.getsize(tmp_path), **extra
+            )
+            with self.manifest.lock:
+                previous = self.manifest.get(data_type, season)
+                os.replace(tmp_path, cache_path)
+                self.manifest.update(entry)
+            
+            if data_type in INDEXED_COLUMNS:
+                with self.instrumentation.timed('index', data_type=data_type, season=season) as record:
+                    index = partition_index.build_index(table, INDEXED_COLUMNS[data_type])
+                    partition_index.write_index(cache_path, entry['checksum'], index)
+                    record['rows'] = table.num_rows
+            
+            # A partition cached earlier in the other format is now superseded
+            if previous and previous['path'] != entry['path']:
+                old_path = os.path.join(self.data_dir, previous['path'])
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return cache_path
+    
+    def _optimize_frame(self, data_type, season, data):
+        """Compact a frame's dtypes against the dataset's registered schema, logging the memory saved"""
+        with self.instrumentation.timed('optimize', data_type=data_type, season=season) as record:
+            data, schema, before, after = dtype_optimizer.optimize_frame(data, self.schemas.get(data_type))
+            self.schemas.update(data_type, schema)
+            record['rows'] = len(data)
+            record['bytes'] = before - after
         
+        if before:
+            label = DATASET_LABELS.get(data_type, data_type)
+            logger.info(f"🗜️  Compacted {label} {season}: {before / 1024 ** 2:.1f} MB -> "
+                        f"{after / 1024 ** 2:.1f} MB in memory ({1 - after / before:.0%} smaller)")
         return data
     
-    def get_pbp_data(self, years, force_refresh=False):
-        """Get play-by-play data with caching"""
-        cache_path = self.get_cache_path('pbp', years)
+    def _read_partition(self, data_type, season, columns=None, filters=None, as_arrow=False):
+        """Read one season partition, decoding only the requested columns and matching rows"""
+        cache_path = self.get_cache_path(data_type, season)
+        timed = self.instrumentation.timed
         
-        if not force_refresh and self.is_cache_valid(cache_path):
-            print(f"📂 Loading PBP data from cache: {cache_path}")
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+        with timed('deserialize', data_type=data_type, season=season) as record:
+            if self.cache_format == 'arrow':
+                # Buffers point straight into the mapped file, so the table costs no heap
+                # memory and processes reading the same file share the page cache
+                with pa.memory_map(cache_path, 'r') as source:
+                    table = pa.ipc.open_file(source).read_all()
+            else:
+                table = pq.read_table(cache_path, columns=columns, filters=filters or None)
+            record['rows'] = table.num_rows
+            record['bytes'] = table.nbytes
         
-        print(f"🌐 Downloading play-by-play data for years {years}...")
-        data = nfl.import_pbp_data(years=years, include_participation=False)
+        if self.cache_format == 'arrow' and (filters or columns is not None):
+            with timed('filter', data_type=data_type, season=season) as record:
+                if filters:
+                    table = table.filter(pq.filters_to_expression(filters))
+                if columns is not None:
+                    table = table.select(columns)
+                record['rows'] = table.num_rows
         
-        print(f"💾 Caching data to: {cache_path}")
-        with open(cache_path, 'wb') as f:
-            pickle.dump(data, f)
+        if as_arrow:
+            return table
+        return self._table_to_pandas(data_type, season, table)
+    
+    def _table_to_pandas(self, data_type, season, table):
+        """Convert a partition table read by _read_partition to a DataFrame"""
+        with self.instrumentation.timed('to_pandas', data_type=data_type, season=season) as record:
+            # One block per column lets null-free numeric columns stay zero-copy views
+            frame = table.to_pandas(split_blocks=self.cache_format == 'arrow')
+            record['rows'] = len(frame)
+        return frame
+    
+    def _partition_lock(self, data_type, season):
+        """Advisory lock serializing work on one partition across threads and processes"""
+        return FileLock(os.path.join(self.data_dir, '.locks', f"{data_type}_{season}.lock"))
+    
+    def _partition_version(self, data_type, season):
+        """Identify the partition currently in the manifest, to notice when another writer replaces it"""
+        entry = self.manifest.get(data_type, season) or {}
+        return entry.get('checksum'), entry.get('written_at')
+    
+    def _fetch_season_once(self, data_type, season, incremental=False, replace_version=None):
+        """Fetch one season unless the same partition is already being fetched
         
-        return data
+        Threads asking for a partition another thread is downloading wait for
+        that download instead of starting their own. Across processes the
+        partition lock lets one worker download while the others wait; once
+        they get the lock they find the fresh manifest entry and skip the download.
+        A forced refresh passes the _partition_version() it decided to replace,
+        and is skipped only if another writer replaced that version meanwhile.
+        """
+        key = (os.path.abspath(self.data_dir), data_type, season)
+        with NFLDataManager._flights_guard:
+            flight = NFLDataManager._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = NFLDataManager._flights[key] = Future()
+        
+        if not leader:
+            self.instrumentation.event('fetch_shared', data_type=data_type)
+            return flight.result()
+        
+        try:
+            with self._partition_lock(data_type, season):
+                if replace_version is None:
+                    cached = self.is_cache_valid(data_type, season)
+                else:
+                    cached = (self._partition_version(data_type, season) != replace_version
+                              and self.is_cache_valid(data_type, season))
+                if cached:
+                    label = DATASET_LABELS.get(data_type, data_type)
+                    logger.info(f"⏳ {label} {season} was cached by another worker meanwhile")
+                    self.instrumentation.event('fetch_shared', data_type=data_type)
+                    result = self.get_cache_path(data_type, season)
+                else:
+                    result = self._fetch_season(data_type, season, incremental)
+            flight.set_result(result)
+            return result
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with NFLDataManager._flights_guard:
+                del NFLDataManager._flights[key]
+    
+    def _fetch_season(self, data_type, season, incremental=False):
+        """Download and cache a single season, retrying transient failures
+        
+        The download replaces the cached partition, so stat corrections to
+        earlier weeks are picked up. With incremental=True a loader that
+        returned only some weeks of the season (a custom loader fetching just
+        the recent weeks) is topped up with the cached rows of the weeks it
+        left out; a full-season download is written as it is.
+        """
+        label = DATASET_LABELS.get(data_type, data_type)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.instrumentation.timed('download', data_type=data_type, season=season) as record:
+                    data = self.loaders[data_type]([season])
+                    record['rows'] = len(data)
+                    record['bytes'] = int(data.memory_usage(deep=False).sum())
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(f"⚠️  {label} {season} download failed ({e}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+        
+        data = data[data['season'] == season].reset_index(drop=True)
+        if data.empty:
+            return None
+        
+        entry = self.manifest.get(data_type, season) if incremental else None
+        if entry is not None and entry.get('max_week') is not None and 'week' in data.columns:
+            new_weeks = sorted(int(week) for week in data['week'].dropna().unique())
+            left_out = []
+            # A download holding weeks 1 through the cached max_week is the whole season so far
+            if not set(range(1, entry['max_week'] + 1)) <= set(new_weeks):
+                cached_weeks = self._read_partition(data_type, season, columns=['week'])['week'].dropna()
+                left_out = sorted(set(int(week) for week in cached_weeks.unique()) - set(new_weeks))
+            if left_out:
+                kept = self._read_partition(data_type, season, filters=[('week', 'in', left_out)])
+                with self.instrumentation.timed('merge', data_type=data_type, season=season) as record:
+                    data = pd.concat([kept, data], ignore_index=True)
+                    record['rows'] = len(data) - len(kept)
+                logger.info(f"🔁 {label} {season}: refreshed weeks {new_weeks} onto {len(kept):,} cached rows")
+        
+        cache_path = self._write_partition(data_type, season, data)
+        logger.info(f"💾 Cached season {season} to: {cache_path}")
+        return cache_path
+    
+    def _fetch_partitions(self, partitions, incremental=(), on_done=None, replace_versions=None):
+        """Fetch (data_type, season) partitions in parallel, caching each as soon as it finishes
+        
+        Partitions that finish are kept on disk even if others fail or the run
+        is interrupted, so a retry only downloads what is still missing.
+        on_done(data_type, season, error) is called as each one completes.
+        replace_versions maps force-refreshed partitions to the version being
+        replaced (see _fetch_season_once). Returns a dict of failed partitions
+        to their exceptions.
+        """
+        failed = {}
+        replace_versions = replace_versions or {}
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(partitions))))
+        try:
+            futures = {
+                executor.submit(
+                    self._fetch_season_once, data_type, season, (data_type, season) in incremental,
+                    replace_versions.get((data_type, season)),
+                ): (data_type, season)
+                for data_type, season in partitions
+            }
+            for future in as_completed(futures):
+                data_type, season = futures[future]
+                error = future.exception()
+                if error is not None:
+                    failed[(data_type, season)] = error
+                    label = DATASET_LABELS.get(data_type, data_type)
+                    logger.error(f"❌ Failed to download {label} data for {season}: {error}")
+                if on_done is not None:
+                    on_done(data_type, season, error)
+        except BaseException:
+            # Drop queued partitions on Ctrl-C; partitions already written stay cached
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        
+        return failed
+    
+    def _fetch_seasons(self, data_type, seasons, incremental=(), replace_versions=None):
+        """Fetch seasons of one dataset in parallel, raising if any of them failed"""
+        label = DATASET_LABELS.get(data_type, data_type)
+        failed = self._fetch_partitions(
+            [(data_type, season) for season in seasons],
+            incremental={(data_type, season) for season in incremental},
+            replace_versions=replace_versions,
+        )
+        
+        if failed:
+            raise RuntimeError(
+                f"Failed to download {label} data for seasons {sorted(season for _, season in failed)}; "
+                f"completed seasons were cached and will not be downloaded again"
+            ) from next(iter(failed.values()))
+    
+    def _stale_seasons(self, data_type, years, force_refresh=False):
+        """Return the seasons needing a download and which of those can be topped up incrementally"""
+        missing = [
+            year for year in years
+            if force_refresh or not self.is_cache_valid(data_type, year)
+        ]
+        # Stale partitions whose file is still there can keep weeks a partial download leaves out
+        incremental = set() if force_refresh else {
+            year for year in missing
+            if (self.manifest.get(data_type, year) or {}).get('format') == self.cache_format
+            and self._partition_exists(self.manifest.get(data_type, year))
+        }
+        return missing, incremental
+    
+    def _ensure_cached(self, data_type, years, force_refresh=False):
+        """Download any requested seasons that are missing or stale, returning the cached seasons"""
+        label = DATASET_LABELS.get(data_type, data_type)
+        years = self.normalize_years(years)
+        
+        missing, incremental = self._stale_seasons(data_type, years, force_refresh)
+        for year in years:
+            self.instrumentation.event('disk_miss' if year in missing else 'disk_hit', data_type=data_type)
+        
+        if missing:
+            logger.info(f"🌐 Downloading {label} data for years {missing}...")
+            replace_versions = {
+                (data_type, year): self._partition_version(data_type, year) for year in missing
+            } if force_refresh else None
+            self._fetch_seasons(data_type, missing, incremental=incremental, replace_versions=replace_versions)
+            self._enforce_cache_budget(protect=[(data_type, year) for year in years])
+        
+        cached = set(self.cached_seasons(data_type))
+        return [year for year in years if year in cached]
+    
+    def _partition_signature(self, data_type, seasons):
+        """Fingerprint the partitions by manifest checksum so memory entries notice rewrites"""
+        return tuple(
+            (season, self.manifest.get(data_type, season)['checksum'])
+            for season in seasons
+        )
+    
+    def _get_data(self, data_type, years, force_refresh=False, columns=None, filters=None,
+                  as_arrow=False):
+        """Assemble a dataset from cached season partitions, downloading only missing seasons"""
+        seasons = self._ensure_cached(data_type, years, force_refresh=force_refresh)
+        return self._load_seasons(data_type, seasons, columns=columns, filters=filters, as_arrow=as_arrow)
+    
+    def _load_seasons(self, data_type, seasons, columns=None, filters=None, as_arrow=False):
+        """Concatenate cached season partitions into one frame
+        
+        Results are served from the memory cache when the same request was
+        loaded before and its partitions are unchanged. The returned frame is a
+        shallow copy, so adding or replacing columns does not touch the cache.
+        as_arrow=True returns a pyarrow Table instead and bypasses the memory
+        cache; with the 'arrow' format that table is backed by the mapped files.
+        """
+        label = DATASET_LABELS.get(data_type, data_type)
+        self.manifest.touch([self.manifest.key(data_type, season) for season in seasons])
+        
+        if as_arrow:
+            tables = [
+                self._read_partition(data_type, season, columns=columns, filters=filters, as_arrow=True)
+                for season in seasons
+            ]
+            if not tables:
+                return pa.table({column: [] for column in columns or []})
+            # Seasons may differ in widened dtypes, dictionary index widths or all-missing columns
+            schema = unify_schemas([table.schema for table in tables])
+            return pa.concat_tables([conform_table(table, schema) for table in tables],
+                                    promote_options='permissive')
+        
+        key = (
+            data_type,
+            tuple(seasons),
+            tuple(columns) if columns is not None else None,
+            repr(filters or []),
+        )
+        signature = self._partition_signature(data_type, seasons)
+        
+        if self.memory_cache.max_bytes:
+            data = self.memory_cache.get(key, signature)
+            self.instrumentation.event('memory_hit' if data is not None else 'memory_miss',
+                                       data_type=data_type)
+            if data is not None:
+                logger.info(f"🧠 Loading {label} data from memory for seasons {seasons}")
+                return data.copy(deep=False)
+        
+        if seasons:
+            logger.info(f"📂 Loading {label} data from cache for seasons {seasons}")
+        
+        frames = [
+            self._read_partition(data_type, season, columns=columns, filters=filters)
+            for season in seasons
+        ]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        
+        # Categoricals from different seasons keep their dtype instead of decaying to object.
+        # A single season is returned as read, so mapped columns are not copied by a concat
+        data = frames[0] if len(frames) == 1 else dtype_optimizer.concat_frames(frames)
+        if self.memory_cache.max_bytes:
+            self.memory_cache.put(key, signature, data)
+        return data.copy(deep=False)
+    
+    def _ensure_qb_features(self, feature_type, years, build, force_refresh=False):
+        """Materialize a per-season QB feature table for each cached weekly season
+        
+        Each feature partition records the checksums of the weekly partition
+        and of the qb_features code it was built from, so only seasons whose
+        weekly data changed are rebuilt, and all of them after a code change.
+        """
+        seasons = self._ensure_cached('weekly', years, force_refresh=force_refresh)
+        builder_checksum = file_checksum(qb_features.__file__)
+        built = False
+        
+        def is_current(season, source_checksum):
+            entry = self.manifest.get(feature_type, season)
+            return (entry is not None and entry['format'] == self.cache_format
+                    and entry.get('source_checksum') == source_checksum
+                    and entry.get('builder_checksum') == builder_checksum
+                    and self._partition_exists(entry))
+        
+        for season in seasons:
+            source_checksum = self.manifest.get('weekly', season)['checksum']
+            if is_current(season, source_checksum):
+                continue
+            
+            # Another process may have built the same table while this one waited for the lock
+            with self._partition_lock(feature_type, season):
+                if is_current(season, source_checksum):
+                    continue
+                logger.info(f"🧮 Building {DATASET_LABELS.get(feature_type, feature_type)} features for {season}")
+                weekly = self._read_partition('weekly', season, filters=[('position', '==', 'QB')])
+                self._write_partition(feature_type, season, build(weekly),
+                                      extra={'source_checksum': source_checksum,
+                                             'builder_checksum': builder_checksum})
+                built = True
+        
+        if built:
+            self._enforce_cache_budget(protect=[
+                (data_type, season) for data_type in ('weekly', feature_type) for season in seasons
+            ])
+        return seasons
+    
+    def get_qb_features(self, years, level='season', window=4, force_refresh=False, columns=None):
+        """Get cached QB feature tables keyed by player_id
+        
+        level='season' returns one row per QB season, 'career' rolls those up
+        across the requested years, and 'rolling' returns trailing window-game
+        sums and rates for every QB game. Rate stats (completion %, yards per
+        attempt, TD %, INT %, EPA per dropback) are recomputed from summed
+        counts rather than averaged.
+        """
+        if level in ('season', 'career'):
+            seasons = self._ensure_qb_features('qb_season', years, qb_features.season_features,
+                                               force_refresh=force_refresh)
+            table = self._load_seasons('qb_season', seasons)
+            if level == 'career':
+                table = qb_features.career_features(table)
+        elif level == 'rolling':
+            feature_type = f"qb_rolling{window}"
+            build = lambda weekly: qb_features.rolling_features(weekly, window)
+            seasons = self._ensure_qb_features(feature_type, years, build, force_refresh=force_refresh)
+            table = self._load_seasons(feature_type, seasons)
+        else:
+            raise ValueError(f"level must be 'season', 'career' or 'rolling', got {level!r}")
+        
+        return table[columns] if columns else table
+    
+    def warm(self, manifest, force_refresh=False, dry_run=False):
+        """Prefetch every dataset and season listed in a warm-cache manifest
+        
+        Missing partitions across all datasets are fetched together on the
+        bounded worker pool, logging progress and an ETA as each finishes.
+        Finished partitions are committed immediately, so an interrupted run
+        resumes where it stopped when warm() is called again. Returns a report
+        of what was fetched, already cached, and failed.
+        """
+        entries = load_warm_manifest(manifest)
+        partitions, incremental, cached = [], set(), 0
+        
+        for entry in entries:
+            data_type = entry['dataset']
+            if data_type not in self.loaders:
+                raise ValueError(f"Unknown dataset {data_type!r}; expected one of {sorted(self.loaders)}")
+            
+            years = self.normalize_years(parse_seasons(entry['seasons']))
+            missing, topped_up = self._stale_seasons(data_type, years, force_refresh)
+            cached += len(years) - len(missing)
+            for season in missing:
+                if (data_type, season) not in partitions:
+                    partitions.append((data_type, season))
+            incremental.update((data_type, season) for season in topped_up)
+        
+        logger.info(f"🔥 Warming cache: {len(partitions)} partitions to fetch, {cached} already cached")
+        report = {'fetched': [], 'cached': cached, 'failed': {}, 'pending': list(partitions)}
+        if dry_run or not partitions:
+            return report
+        
+        start = time.perf_counter()
+        progress = {'done': 0}
+        
+        def on_done(data_type, season, error):
+            progress['done'] += 1
+            done = progress['done']
+            if error is None:
+                report['fetched'].append((data_type, season))
+            elapsed = time.perf_counter() - start
+            eta = elapsed / done * (len(partitions) - done)
+            status = "✅" if error is None else "❌"
+            label = DATASET_LABELS.get(data_type, data_type)
+            logger.info(f"   [{done}/{len(partitions)}] {status} {label} {season} "
+                        f"({elapsed:.0f}s elapsed, ETA {eta:.0f}s)")
+        
+        replace_versions = {
+            partition: self._partition_version(*partition) for partition in partitions
+        } if force_refresh else None
+        report['failed'] = self._fetch_partitions(partitions, incremental=incremental, on_done=on_done,
+                                                  replace_versions=replace_versions)
+        report['pending'] = []
+        self._enforce_cache_budget(protect=report['fetched'])
+        
+        # Manifest column lists are checked against the cache's recorded schema
+        for entry in entries:
+            wanted = set(entry.get('columns') or [])
+            for season in parse_seasons(entry['seasons']):
+                cached_entry = self.manifest.get(entry['dataset'], season)
+                absent = wanted - set(cached_entry['columns']) if cached_entry else set()
+                if absent:
+                    logger.warning(f"⚠️  {entry['dataset']} {season} has no columns {sorted(absent)}")
+        
+        return report
+    
+    def export_bundle(self, path, datasets=None, seasons=None, level=10):
+        """Pack cached partitions (optionally only some datasets/seasons) into a .tar.zst bundle"""
+        return cache_bundle.export_bundle(self, path, datasets=datasets, seasons=seasons, level=level)
+    
+    def import_bundle(self, path, overwrite=False):
+        """Unpack a bundle into this cache, skipping identical partitions and verifying checksums"""
+        return cache_bundle.import_bundle(self, path, overwrite=overwrite, workers=self.max_workers)
+    
+    def get_player_crosswalk(self, refresh=True):
+        """Return the player crosswalk: one int32 player_key per player with GSIS/PFR ids and names
+        
+        The crosswalk is built from the ID columns of cached weekly, play-by-play
+        and draft partitions and stored in the cache. With refresh=True only
+        partitions added or rewritten since the last build are read and merged.
+        Keys are stable except when a PFR-only player is linked to a GSIS id
+        that already had its own key: the two rows collapse into one keeping
+        the newer key, so frames keyed before the refresh should be re-keyed.
+        """
+        path = os.path.join(self.data_dir, player_crosswalk.CROSSWALK_NAME)
+        
+        def pending(sources):
+            return [
+                (key, entry) for key, entry in sorted(self.manifest.entries().items())
+                if entry['data_type'] in player_crosswalk.ID_SOURCES
+                and entry['format'] == self.cache_format and sources.get(key) != entry['checksum']
+            ]
+        
+        crosswalk, sources = player_crosswalk.read_crosswalk(path)
+        if not refresh or not pending(sources):
+            return crosswalk
+        
+        with self._partition_lock('player_crosswalk', 'all'):
+            # Re-read under the lock in case another process just extended it
+            crosswalk, sources = player_crosswalk.read_crosswalk(path)
+            new = pending(sources)
+            if not new:
+                return crosswalk
+            
+            with self.instrumentation.timed('crosswalk') as record:
+                ids = []
+                for key, entry in new:
+                    columns = player_crosswalk.source_columns(entry['data_type'], entry['columns'])
+                    frame = self._read_partition(entry['data_type'], entry['season'], columns=columns)
+                    ids.append(player_crosswalk.extract_ids(entry['data_type'], frame))
+                    sources[key] = entry['checksum']
+                crosswalk = player_crosswalk.merge_ids(crosswalk, pd.concat(ids, ignore_index=True))
+                player_crosswalk.write_crosswalk(path, crosswalk, sources)
+                record['rows'] = len(crosswalk)
+        
+        logger.info(f"🪪 Player crosswalk: {len(crosswalk):,} players ({len(new)} partitions merged)")
+        return crosswalk
+    
+    def add_player_keys(self, frame, id_column='player_id', id_type='gsis', fallback_column=None,
+                        key_column='player_key'):
+        """Add an int32 player_key column to frame for joins across datasets; unknown ids get -1
+        
+        id_column holds GSIS ids by default (weekly player_id, pbp *_player_id,
+        draft gsis_id); use id_type='pfr' for PFR ids. For draft frames pass
+        fallback_column='pfr_player_id' to key picks that have no GSIS id.
+        Drop rows keyed -1 before merging, or unknown players match each other.
+        """
+        return player_crosswalk.attach_keys(frame, self.get_player_crosswalk(), id_column,
+                                            id_type=id_type, fallback_column=fallback_column,
+                                            key_column=key_column)
+    
+    def query(self, sql, params=None, years=None, as_arrow=False):
+        """Run SQL over the cached partitions and return only the result as a DataFrame
+        
+        Each cached dataset is a table named after it (weekly, pbp, draft,
+        qb_season, ...). With years given, the upstream datasets the query
+        mentions are downloaded for those seasons first. Needs duckdb.
+        """
+        if years is not None:
+            for data_type in cache_query.referenced_datasets(sql, DATASET_LOADERS):
+                self._ensure_cached(data_type, years)
+        
+        with self.instrumentation.timed('query') as record:
+            result = cache_query.run_query(self, sql, params=params, as_arrow=as_arrow)
+            record['rows'] = len(result)
+        return result
+    
+    def timing_summary(self):
+        """Return per-stage timings (download, serialize, deserialize, filter, ...) as a DataFrame"""
+        return self.instrumentation.summary()
     
-    def get_draft_data(self, years, force_refresh=False):
+    def memory_cache_stats(self):
+        """Return hit/miss/eviction counters for the in-memory cache"""
+        return self.memory_cache.stats()
+    
+    def get_weekly_data(self, years, force_refresh=False, columns=None, position=None,
+                        season_type=None, weeks=None, player_ids=None, filters=None, as_arrow=False):
+        """Get weekly data with caching, applying column and row filters at read time"""
+        filters = build_filters(
+            position=position, season_type=season_type, weeks=weeks,
+            player_ids=player_ids, filters=filters
+        )
+        return self._get_data('weekly', years, force_refresh=force_refresh, columns=columns,
+                              filters=filters, as_arrow=as_arrow)
+    
+    def get_pbp_data(self, years, force_refresh=False, columns=None, season_type=None,
+                     weeks=None, player_ids=None, filters=None, as_arrow=False):
+        """Get play-by-play data with caching; player_ids match passer_player_id"""
+        filters = build_filters(
+            season_type=season_type, weeks=weeks, player_ids=player_ids,
+            player_id_column='passer_player_id', filters=filters
+        )
+        return self._get_data('pbp', years, force_refresh=force_refresh, columns=columns,
+                              filters=filters, as_arrow=as_arrow)
+    
+    def get_draft_data(self, years, force_refresh=False, columns=None, position=None, filters=None,
+                       as_arrow=False):
         """Get draft data with caching"""
-        cache_path = self.get_cache_path('draft', years)
+        filters = build_filters(position=position, filters=filters)
+        return self._get_data('draft', years, force_refresh=force_refresh, columns=columns,
+                              filters=filters, as_arrow=as_arrow)
+    
+    def _async_state(self):
+        """Return the concurrency semaphore and in-flight loads for the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._async_states.get(loop)
+        if state is None:
+            state = self._async_states[loop] = (asyncio.Semaphore(self.async_concurrency), {})
+        return state
+    
+    async def _arun(self, method, years, **kwargs):
+        """Run a blocking get_* method on a worker thread, sharing one load between identical requests
+        
+        Coroutines asking for the same method, seasons and arguments while a
+        load is in flight await that load instead of starting another. A
+        cancelled caller does not cancel the load for the others.
+        """
+        semaphore, in_flight = self._async_state()
+        key = (method, tuple(self.normalize_years(years)), repr(sorted(kwargs.items())))
+        
+        task = in_flight.get(key)
+        if task is None:
+            async def load():
+                async with semaphore:
+                    return await asyncio.to_thread(getattr(self, method), years, **kwargs)
+            
+            def forget(done):
+                if in_flight.get(key) is done:
+                    del in_flight[key]
+            
+            task = in_flight[key] = asyncio.ensure_future(load())
+            task.add_done_callback(forget)
+        else:
+            self.instrumentation.event('async_shared', method=method)
+        
+        result = await asyncio.shield(task)
+        # Each caller gets its own frame, as with the blocking methods
+        return result.copy(deep=False) if isinstance(result, pd.DataFrame) else result
+    
+    async def aget_weekly_data(self, years, **kwargs):
+        """Async get_weekly_data: loads off the event loop, sharing identical in-flight requests"""
+        return await self._arun('get_weekly_data', years, **kwargs)
+    
+    async def aget_pbp_data(self, years, **kwargs):
+        """Async get_pbp_data: loads off the event loop, sharing identical in-flight requests"""
+        return await self._arun('get_pbp_data', years, **kwargs)
+    
+    async def aget_draft_data(self, years, **kwargs):
+        """Async get_draft_data: loads off the event loop, sharing identical in-flight requests"""
+        return await self._arun('get_draft_data', years, **kwargs)
+    
+    def _index_ranges(self, data_type, season, column, value):
+        """Look up the row ranges holding value in a partition's index, rebuilding a missing or stale index
+        
+        Partitions cached before indexing existed or imported from a bundle
+        get their index built from the indexed columns on first lookup.
+        """
+        entry = self.manifest.get(data_type, season)
+        cache_path = self.get_cache_path(data_type, season)
+        ranges = partition_index.lookup(cache_path, entry['checksum'], column, value)
+        if ranges is None:
+            columns = [name for name in INDEXED_COLUMNS[data_type] if name in entry['columns']]
+            with self.instrumentation.timed('index', data_type=data_type, season=season) as record:
+                table = self._read_partition(data_type, season, columns=columns, as_arrow=True)
+                partition_index.write_index(cache_path, entry['checksum'],
+                                            partition_index.build_index(table, columns))
+                record['rows'] = table.num_rows
+            ranges = partition_index.lookup(cache_path, entry['checksum'], column, value) or []
+        return ranges
+    
+    def _indexed_rows(self, data_type, column, value, seasons, columns=None, as_arrow=False):
+        """Read only the rows whose indexed column equals value from each season partition"""
+        self.manifest.touch([self.manifest.key(data_type, season) for season in seasons])
+        tables = []
+        for season in seasons:
+            ranges = self._index_ranges(data_type, season, column, value)
+            if not ranges:
+                continue
+            with self.instrumentation.timed('deserialize', data_type=data_type, season=season) as record:
+                table = partition_index.read_ranges(
+                    self.get_cache_path(data_type, season), self.cache_format, ranges, columns=columns
+                )
+                record['rows'] = table.num_rows
+                record['bytes'] = table.nbytes
+            tables.append(table)
         
-        if not force_refresh and self.is_cache_valid(cache_path):
-            print(f"📂 Loading draft data from cache: {cache_path}")
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+        if not tables:
+            empty = pa.table({name: [] for name in columns or []})
+            return empty if as_arrow else empty.to_pandas()
+        schema = unify_schemas([table.schema for table in tables])
+        table = pa.concat_tables([conform_table(table, schema) for table in tables],
+                                 promote_options='permissive')
+        return table if as_arrow else table.to_pandas()
+    
+    def get_player_plays(self, player_id, seasons, columns=None, force_refresh=False, as_arrow=False):
+        """Get a QB's dropbacks (plays with them as passer_player_id), reading only their row ranges"""
+        seasons = self._ensure_cached('pbp', seasons, force_refresh=force_refresh)
+        return self._indexed_rows('pbp', 'passer_player_id', player_id, seasons, columns, as_arrow)
+    
+    def get_team_plays(self, team, seasons, columns=None, force_refresh=False, as_arrow=False):
+        """Get every play with team in possession (posteam), reading only its row ranges"""
+        seasons = self._ensure_cached('pbp', seasons, force_refresh=force_refresh)
+        return self._indexed_rows('pbp', 'posteam', team, seasons, columns, as_arrow)
+    
+    def get_game(self, game_id, columns=None, force_refresh=False, as_arrow=False):
+        """Get the play-by-play of one game, e.g. '2023_01_DET_KC', from its season's index"""
+        # nflverse game ids start with the season
+        seasons = self._ensure_cached('pbp', [int(str(game_id)[:4])], force_refresh=force_refresh)
+        return self._indexed_rows('pbp', 'game_id', game_id, seasons, columns, as_arrow)
+    
+    def iter_pbp(self, years, columns=None, chunk_by='season', rows=None, filters=None, force_refresh=False):
+        """Yield play-by-play data in bounded chunks straight from the season partitions
         
-        print(f"🌐 Downloading draft data for years {years}...")
-        data = nfl.import_draft_picks(years=years)
+        chunk_by='season' yields one frame per season, chunk_by='game' one frame
+        per game_id, and chunk_by='rows' (or passing rows=N) frames of at most
+        N rows. Only one chunk plus a partial game is held in memory at a time.
+        """
+        if rows is not None:
+            chunk_by = 'rows'
+        if chunk_by not in ('season', 'game', 'rows'):
+            raise ValueError(f"chunk_by must be 'season', 'game' or 'rows', got {chunk_by!r}")
         
-        print(f"💾 Caching data to: {cache_path}")
-        with open(cache_path, 'wb') as f:
-            pickle.dump(data, f)
+        seasons = self._ensure_cached('pbp', years, force_refresh=force_refresh)
+        self.manifest.touch([self.manifest.key('pbp', season) for season in seasons])
         
-        return data
+        for season in seasons:
+            if chunk_by == 'season':
+                yield self._read_partition('pbp', season, columns=columns, filters=filters)
+            elif chunk_by == 'rows':
+                for batch in self._iter_partition_batches('pbp', season, columns, filters, rows):
+                    yield batch.to_pandas()
+            else:
+                yield from self._iter_games(season, columns, filters)
+    
+    def _iter_partition_batches(self, data_type, season, columns, filters, batch_size=None):
+        """Stream record batches from one partition with projection and filters pushed down"""
+        dataset_format = 'ipc' if self.cache_format == 'arrow' else 'parquet'
+        dataset = ds.dataset(self.get_cache_path(data_type, season), format=dataset_format)
+        expression = pq.filters_to_expression(filters) if filters else None
+        
+        for batch in dataset.to_batches(columns=columns, filter=expression,
+                                        batch_size=batch_size or PARTITION_ROW_GROUP_SIZE):
+            if batch.num_rows:
+                yield batch
+    
+    def _iter_games(self, season, columns, filters):
+        """Yield one frame per game, carrying a partial game across batch boundaries"""
+        read_columns = columns
+        if columns is not None and 'game_id' not in columns:
+            read_columns = list(columns) + ['game_id']
+        
+        carry = None
+        for batch in self._iter_partition_batches('pbp', season, read_columns, filters):
+            chunk = batch.to_pandas()
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            
+            # The last game in the batch may continue in the next one
+            last_game = chunk['game_id'].iloc[-1]
+            is_last = (chunk['game_id'] == last_game).to_numpy()
+            carry = chunk[is_last]
+            
+            for _, game in chunk[~is_last].groupby('game_id', sort=False, observed=True):
+                yield game[columns].reset_index(drop=True) if columns else game.reset_index(drop=True)
+        
+        if carry is not None and len(carry):
+            yield carry[columns].reset_index(drop=True) if columns else carry.reset_index(drop=True)
+    
+    def legacy_cache_files(self):
+        """Return (path, bytes) for each pre-partition .pkl range cache left in the cache directory"""
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(
+            (entry.path, entry.stat().st_size) for entry in os.scandir(self.data_dir)
+            if entry.is_file() and entry.name.endswith(LEGACY_CACHE_SUFFIX)
+        )
+    
+    def cache_size(self):
+        """Return the total size in bytes of all partitions recorded in the manifest"""
+        return sum(entry['bytes'] for entry in self.manifest.entries().values())
+    
+    @staticmethod
+    def _eviction_rank(entry):
+        """Sort key for eviction: volatile partitions first, then least recently used
+        
+        Current-season partitions are refreshed soon anyway and derived feature
+        tables rebuild locally without a download, so both go before completed
+        upstream seasons, which are immutable and the most expensive to replace.
+        """
+        volatile = entry['data_type'] not in DATASET_LOADERS or entry['season'] >= current_season()
+        return (0 if volatile else 1, entry.get('last_access') or entry['written_at'])
+    
+    def prune(self, max_bytes=None, older_than=None, protect=(), dry_run=False):
+        """Evict cached partitions without prompting, for cron jobs and scripts
+        
+        older_than (days or a timedelta) drops partitions not read or written
+        within that window. max_bytes then evicts partitions in _eviction_rank
+        order until the cache fits. (data_type, season) pairs in protect are
+        never evicted. Legacy .pkl range caches (see legacy_cache_files) are
+        always removed. Returns a report of what was (or would be) removed.
+        """
+        if older_than is not None and not isinstance(older_than, timedelta):
+            older_than = timedelta(days=older_than)
+        protect = {self.manifest.key(data_type, season) for data_type, season in protect}
+        
+        with self.manifest.lock:
+            entries = self.manifest.entries()
+            total = sum(entry['bytes'] for entry in entries.values())
+            candidates = sorted(
+                ((key, entry) for key, entry in entries.items() if key not in protect),
+                key=lambda item: self._eviction_rank(item[1]),
+            )
+            
+            evict = {}
+            if older_than is not None:
+                cutoff = (datetime.now() - older_than).isoformat(timespec='seconds')
+                for key, entry in candidates:
+                    if (entry.get('last_access') or entry['written_at']) < cutoff:
+                        evict[key] = entry
+            if max_bytes is not None:
+                remaining = total - sum(entry['bytes'] for entry in evict.values())
+                for key, entry in candidates:
+                    if remaining <= max_bytes:
+                        break
+                    if key not in evict:
+                        evict[key] = entry
+                        remaining -= entry['bytes']
+            
+            freed = sum(entry['bytes'] for entry in evict.values())
+            if evict and not dry_run:
+                for entry in evict.values():
+                    path = os.path.join(self.data_dir, entry['path'])
+                    for stale in (path, partition_index.index_path(path)):
+                        if os.path.exists(stale):
+                            os.remove(stale)
+                self.manifest.remove(evict)
+        
+        legacy = self.legacy_cache_files()
+        if legacy and not dry_run:
+            for path, _ in legacy:
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        report = {
+            'evicted': [(entry['data_type'], entry['season']) for entry in evict.values()],
+            'freed_bytes': freed,
+            'remaining_bytes': total - freed,
+            'legacy_removed': [os.path.basename(path) for path, _ in legacy],
+            'legacy_bytes': sum(size for _, size in legacy),
+        }
+        if evict:
+            verb = "Would evict" if dry_run else "Evicted"
+            logger.info(f"🧹 {verb} {len(evict)} partitions ({freed / 1024 ** 2:.1f} MB), "
+                        f"{report['remaining_bytes'] / 1024 ** 2:.1f} MB left in cache")
+        if legacy:
+            verb = "Would remove" if dry_run else "Removed"
+            logger.info(f"🧹 {verb} {len(legacy)} legacy .pkl caches "
+                        f"({report['legacy_bytes'] / 1024 ** 2:.1f} MB)")
+        return report
+    
+    def _enforce_cache_budget(self, protect=()):
+        """Prune back under max_cache_bytes, keeping the partitions the caller is about to read"""
+        if self.max_cache_bytes is None:
+            return
+        report = self.prune(max_bytes=self.max_cache_bytes, protect=protect)
+        if report['remaining_bytes'] > self.max_cache_bytes:
+            logger.warning(f"⚠️  Cache is {report['remaining_bytes'] / 1024 ** 2:.1f} MB, over its "
+                           f"{self.max_cache_bytes / 1024 ** 2:.1f} MB budget: the requested seasons "
+                           f"alone do not fit")
     
     def list_cached_files(self):
-        """List all cached data files"""
+        """List all cached data files recorded in the manifest"""
         print("📁 Cached Data Files:")
         print("-" * 40)
         
@@ -92,18 +1258,27 @@ class NFLDataManager:
             print("   No cache directory found")
             return
         
-        files = os.listdir(self.data_dir)
-        if not files:
+        entries = self.manifest.entries()
+        legacy = self.legacy_cache_files()
+        if not entries and not legacy:
             print("   No cached files found")
             return
         
-        for file in sorted(files):
-            file_path = os.path.join(self.data_dir, file)
-            size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            print(f"   📄 {file}")
-            print(f"      Size: {size_mb:.1f} MB")
+        for entry in sorted(entries.values(), key=lambda e: e['path']):
+            size_mb = entry['bytes'] / (1024 * 1024)
+            mod_time = datetime.fromisoformat(entry['written_at'])
+            print(f"   📄 {entry['path']}")
+            print(f"      Size: {size_mb:.1f} MB, Rows: {entry['rows']:,}")
             print(f"      Modified: {mod_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            if entry.get('last_access'):
+                print(f"      Last used: {entry['last_access'].replace('T', ' ')}")
+        
+        if legacy:
+            legacy_mb = sum(size for _, size in legacy) / (1024 * 1024)
+            print(f"   ⚠️  {len(legacy)} legacy .pkl caches ({legacy_mb:.1f} MB) are no longer read; "
+                  f"prune() removes them:")
+            for path, size in legacy:
+                print(f"      🗑️  {os.path.basename(path)} ({size / (1024 * 1024):.1f} MB)")
     
     def clear_cache(self, confirm=True):
         """Clear all cached data"""
@@ -117,12 +1292,15 @@ class NFLDataManager:
             import shutil
             shutil.rmtree(self.data_dir)
             os.makedirs(self.data_dir, exist_ok=True)
+            self.memory_cache.clear()
             print("🗑️  Cache cleared successfully")
         else:
             print("📁 No cache directory to clear")
 
 def main():
     """Example usage of the NFLDataManager"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("NFL Data Manager - Example Usage")
     print("=" * 50)
     
@@ -155,6 +1333,8 @@ def main():
     print("\n" + "="*50)
     dm.list_cached_files()
     
+    print("\n" + dm.instrumentation.report())
+    
     print("\n💡 Next time you run this, data will load from cache instantly!")
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Partition Index - Secondary indexes from column values to row ranges in a cached partition
+Lets NFLDataManager read one player's or one game's plays without scanning the whole season
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cache_manifest import atomic_write
+
+INDEX_SUFFIX = '.index.parquet'
+INDEX_VERSION = '1'
+
+# Small row groups let a lookup's column/value filter skip most of the sidecar
+INDEX_ROW_GROUP_SIZE = 4096
+
+def index_path(partition_path):
+    """Return the sidecar path for a partition file"""
+    return os.path.splitext(partition_path)[0] + INDEX_SUFFIX
+
+def value_ranges(column, values):
+    """Return a frame of the [start, stop) row ranges of each consecutive run of non-null values"""
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    starts = np.flatnonzero(np.diff(codes, prepend=-2))
+    stops = np.append(starts[1:], len(codes))
+    keep = codes[starts] >= 0
+    starts, stops = starts[keep], stops[keep]
+    return pd.DataFrame({
+        'column': column,
+        'value': np.asarray(uniques, dtype=object)[codes[starts]].astype(str),
+        'start': starts.astype('int64'),
+        'stop': stops.astype('int64'),
+    })
+
+def build_index(table, columns):
+    """Index the given columns of a pyarrow table (skipping ones it lacks), sorted for lookups"""
+    frames = [
+        value_ranges(column, table.column(column).to_pandas())
+        for column in columns if column in table.column_names
+    ]
+    index = pd.concat(frames, ignore_index=True) if frames else value_ranges('', [])
+    return index.sort_values(['column', 'value', 'start'], ignore_index=True)
+
+def write_index(partition_path, checksum, index):
+    """Store an index next to its partition, tagged with the partition's checksum"""
+    table = pa.Table.from_pandas(index, preserve_index=False).replace_schema_metadata({
+        'version': INDEX_VERSION,
+        'checksum': checksum,
+    })
+    with atomic_write(index_path(partition_path)) as f:
+        pq.write_table(table, f, row_group_size=INDEX_ROW_GROUP_SIZE)
+
+def lookup(partition_path, checksum, column, value):
+    """Return the row ranges of value in column, or None if the index is missing or stale"""
+    path = index_path(partition_path)
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    if metadata.get(b'version') != INDEX_VERSION.encode() or metadata.get(b'checksum') != checksum.encode():
+        return None
+
+    ranges = pq.read_table(
+        path, columns=['start', 'stop'],
+        filters=[('column', '==', column), ('value', '==', str(value))],
+    )
+    return list(zip(ranges.column('start').to_pylist(), ranges.column('stop').to_pylist()))
+
+def read_ranges(partition_path, cache_format, ranges, columns=None):
+    """Read only the rows in the given [start, stop) ranges of a partition as one table
+
+    Parquet partitions decode just the row groups the ranges touch; Arrow
+    partitions are memory-mapped and sliced without copying.
+    """
+    if cache_format == 'arrow':
+        with pa.memory_map(partition_path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        pieces = [table.slice(start, stop - start) for start, stop in ranges]
+        return pa.concat_tables(pieces) if pieces else table.slice(0, 0)
+
+    parquet_file = pq.ParquetFile(partition_path)
+    metadata = parquet_file.metadata
+    bounds, offset = [], 0
+    for group in range(metadata.num_row_groups):
+        rows = metadata.row_group(group).num_rows
+        bounds.append((offset, offset + rows))
+        offset += rows
+
+    groups = [
+        group for group, (first, last) in enumerate(bounds)
+        if any(start < last and stop > first for start, stop in ranges)
+    ]
+    if not groups:
+        empty = parquet_file.schema_arrow.empty_table()
+        return empty.select(columns) if columns is not None else empty
+    table = parquet_file.read_row_groups(groups, columns=columns)
+
+    # Translate file row numbers into positions within the row groups that were read
+    pieces, position = [], 0
+    for group in groups:
+        first, last = bounds[group]
+        for start, stop in ranges:
+            lo, hi = max(start, first), min(stop, last)
+            if lo < hi:
+                pieces.append(table.slice(position + lo - first, hi - lo))
+        position += last - first
+    return pa.concat_tables(pieces)
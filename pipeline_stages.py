@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Pipeline Stages - Memoized analysis stages, skip-if-unchanged bookkeeping and parallel figure rendering
+Used by the analysis.py scripts that new_project.py generates
+"""
+
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import re
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_manifest import atomic_write
+
+def code_fingerprint(code):
+    """Hash a function's or module's source, falling back to a function's bytecode when the source is unavailable"""
+    try:
+        source = inspect.getsource(code).encode()
+    except (OSError, TypeError):
+        source = code.__code__.co_code
+    return hashlib.sha256(source).hexdigest()[:16]
+
+def fingerprint(*parts):
+    """Return a short stable hash of JSON-able values, DataFrames, functions and modules"""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(list(columns)).encode())
+        elif callable(part) or inspect.ismodule(part):
+            digest.update(code_fingerprint(part).encode())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=repr).encode())
+    return digest.hexdigest()[:16]
+
+def cache_fingerprint(manager, data_type, years):
+    """Fingerprint the NFLDataManager partitions a stage reads, by their manifest checksums
+
+    Missing or stale seasons are downloaded first, so the fingerprint names
+    the data the stage will actually read and stays the same between runs
+    until that data changes.
+    """
+    seasons = manager._ensure_cached(data_type, years)
+    return fingerprint([(season, manager.manifest.get(data_type, season)['checksum']) for season in seasons])
+
+class Pipeline:
+    """Memoizes DataFrame-returning stage functions as Parquet files under data_dir
+
+    A stage's output is stored as <stage>-<key>.parquet, where the key hashes
+    the stage's source code, the source of any modules it depends on, its
+    keyword parameters, and the versions of the frames passed in (the key of
+    the stage that produced each one, otherwise a hash of its contents).
+    Calling a stage whose key already has a file loads that file instead of
+    running it, so changing a downstream parameter reuses everything
+    upstream. Treat stage outputs as read-only: a frame modified in place
+    keeps the version it was returned with.
+    """
+
+    def __init__(self, data_dir='data', keep=3):
+        self.data_dir = data_dir
+        self.keep = keep
+        self._versions = {}
+
+    def version(self, frame):
+        """Return the version of a frame: its stage key if a stage returned it, else a content hash"""
+        entry = self._versions.get(id(frame))
+        if entry is not None and entry[0]() is frame:
+            return entry[1]
+        return fingerprint(frame)
+
+    def _remember(self, frame, key):
+        self._versions = {
+            frame_id: entry for frame_id, entry in self._versions.items() if entry[0]() is not None
+        }
+        self._versions[id(frame)] = (weakref.ref(frame), key)
+
+    def _prune(self, name):
+        """Keep only the most recently used outputs of a stage"""
+        pattern = re.compile(rf"{re.escape(name)}-[0-9a-f]{{16}}\.parquet$")
+        paths = [
+            path for path in glob.glob(os.path.join(glob.escape(self.data_dir), f"{name}-*.parquet"))
+            if pattern.match(os.path.basename(path))
+        ]
+        for path in sorted(paths, key=os.path.getmtime, reverse=True)[self.keep:]:
+            os.remove(path)
+
+    def stage(self, func=None, *, name=None, depends=()):
+        """Decorator turning func(*frames, **params) into a memoized stage
+
+        depends lists modules whose code the stage relies on (e.g. qb_features),
+        so editing them reruns it. Pass upstream_version=... when calling a
+        stage to key it on data it reads itself, such as cache_fingerprint()
+        of the NFL data it loads.
+        """
+        if func is None:
+            return functools.partial(self.stage, name=name, depends=depends)
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def run(*frames, upstream_version=None, **params):
+            import pandas as pd
+
+            key = fingerprint(func, *depends, [self.version(frame) for frame in frames], params,
+                              upstream_version)
+            path = os.path.join(self.data_dir, f"{stage_name}-{key}.parquet")
+
+            if os.path.exists(path):
+                print(f"⏭️  {stage_name}: inputs unchanged, reusing {path}")
+                result = pd.read_parquet(path)
+                os.utime(path)
+            else:
+                print(f"⚙️  {stage_name}: running")
+                result = func(*frames, **params)
+                if not isinstance(result, pd.DataFrame):
+                    raise TypeError(f"Stage {stage_name} must return a DataFrame, got {type(result).__name__}")
+                with atomic_write(path) as f:
+                    result.to_parquet(f)
+                self._prune(stage_name)
+
+            self._remember(result, key)
+            return result
+        return run
+
+class RunState:
+    """Last fingerprint of each stage, kept in a JSON file between runs"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.fingerprints = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.fingerprints = {}
+
+    def is_current(self, stage, stage_fingerprint, outputs=()):
+        """True if the stage last ran with this fingerprint and its outputs still exist"""
+        return (self.fingerprints.get(stage) == stage_fingerprint
+                and all(os.path.exists(path) for path in outputs))
+
+    def record(self, stage, stage_fingerprint):
+        """Remember a stage's fingerprint and persist the state"""
+        self.fingerprints[stage] = stage_fingerprint
+        with atomic_write(self.path, 'w') as f:
+            json.dump(self.fingerprints, f, indent=2, sort_keys=True)
+
+def _render(plot, data, path, dpi):
+    """Render one figure headlessly in a worker process"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    figure = plot(data)
+    figure.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(figure)
+    return path
+
+def render_figures(figures, data, output_dir, state=None, data_fingerprint=None, dpi=300,
+                   max_workers=None):
+    """Render {name: plot_function} figures of data to PNGs in parallel worker processes
+
+    Each plot function takes the data and returns a matplotlib Figure; it must
+    be defined at module level so worker processes can import it. With a
+    RunState, figures whose code and data are unchanged since the last run
+    (and whose PNG still exists) are skipped; pass data_fingerprint when the
+    data's version is already known, instead of hashing its contents.
+    Returns the paths rendered.
+    """
+    data_fingerprint = data_fingerprint or fingerprint(data)
+    jobs = {}
+    for name, plot in figures.items():
+        path = os.path.join(output_dir, f"{name}.png")
+        figure_fingerprint = fingerprint(plot, data_fingerprint, dpi)
+        if state is not None and state.is_current(f"figure:{name}", figure_fingerprint, [path]):
+            print(f"⏭️  {name}.png is up to date")
+            continue
+        jobs[name] = (plot, path, figure_fingerprint)
+
+    if not jobs:
+        return []
+
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+        futures = {
+            name: pool.submit(_render, plot, data, path, dpi)
+            for name, (plot, path, _) in jobs.items()
+        }
+        rendered = []
+        for name, future in futures.items():
+            rendered.append(future.result())
+            if state is not None:
+                state.record(f"figure:{name}", jobs[name][2])
+            print(f"🖼️  Rendered {rendered[-1]}")
+    return rendered
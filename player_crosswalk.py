@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Player Crosswalk - One integer key per player across weekly, play-by-play and draft data
+Built from the ID columns of cached partitions, so joins never depend on player_name spellings
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cache_manifest import atomic_write
+
+CROSSWALK_NAME = 'player_crosswalk.parquet'
+CROSSWALK_VERSION = '2'
+
+CROSSWALK_COLUMNS = ['player_key', 'gsis_id', 'pfr_id', 'display_name', 'short_name',
+                     'first_season', 'last_season']
+
+# (gsis id, pfr id, full name, short name) columns identifying players in each dataset
+ID_SOURCES = {
+    'weekly': [('player_id', None, 'player_display_name', 'player_name')],
+    'draft': [('gsis_id', 'pfr_player_id', 'pfr_player_name', None)],
+    'pbp': [
+        ('passer_player_id', None, None, 'passer_player_name'),
+        ('rusher_player_id', None, None, 'rusher_player_name'),
+        ('receiver_player_id', None, None, 'receiver_player_name'),
+    ],
+}
+
+def empty_crosswalk():
+    """Return a crosswalk with no players"""
+    frame = pd.DataFrame({column: pd.Series(dtype=object) for column in CROSSWALK_COLUMNS})
+    return frame.astype({'player_key': 'int32', 'first_season': 'float64', 'last_season': 'float64'})
+
+def source_columns(data_type, available):
+    """Return the ID and name columns a dataset partition can contribute"""
+    return sorted({
+        column
+        for spec in ID_SOURCES.get(data_type, [])
+        for column in spec if column is not None and column in available
+    } | ({'season'} & set(available)))
+
+def extract_ids(data_type, frame):
+    """Collect (gsis_id, pfr_id, display_name, short_name, season) rows from one partition"""
+    parts = []
+    for gsis, pfr, display, short in ID_SOURCES.get(data_type, []):
+        if gsis not in frame and (pfr is None or pfr not in frame):
+            continue
+        part = pd.DataFrame({
+            target: frame[source].astype(object) if source in frame else None
+            for target, source in (('gsis_id', gsis), ('pfr_id', pfr),
+                                   ('display_name', display), ('short_name', short))
+        })
+        part['season'] = frame['season'].to_numpy() if 'season' in frame else np.nan
+        parts.append(part.dropna(subset=['gsis_id', 'pfr_id'], how='all'))
+    if not parts:
+        return pd.DataFrame(columns=['gsis_id', 'pfr_id', 'display_name', 'short_name', 'season'])
+    return pd.concat(parts, ignore_index=True).drop_duplicates()
+
+def _identity(frame):
+    """gsis_id where known, otherwise 'pfr:<pfr_id>'"""
+    return frame['gsis_id'].fillna('pfr:' + frame['pfr_id'].astype('string')).astype(object)
+
+def _collapse(crosswalk):
+    """Merge crosswalk rows that now share an identity into one row keeping the newest player_key"""
+    ordered = crosswalk.sort_values('player_key')
+    merged = ordered.groupby(_identity(ordered), sort=False).agg(
+        player_key=('player_key', 'max'),
+        gsis_id=('gsis_id', 'first'),
+        pfr_id=('pfr_id', 'first'),
+        display_name=('display_name', 'first'),
+        short_name=('short_name', 'first'),
+        first_season=('first_season', 'min'),
+        last_season=('last_season', 'max'),
+    )
+    return merged.reset_index(drop=True)[CROSSWALK_COLUMNS]
+
+def merge_ids(crosswalk, ids):
+    """Fold newly seen IDs into the crosswalk, keeping existing player_keys unless two rows merge
+
+    A player first seen with only a PFR id (e.g. a draft pick without an NFL
+    snap yet) keeps their key once a later partition links that PFR id to a
+    GSIS id. If the GSIS id already had a key of its own (the player's weekly
+    rows were merged before the link), the two rows collapse into one that
+    keeps the newer key. The highest key therefore always survives, and new
+    players get keys after it, so a dropped key is never reused, but frames
+    keyed with the older key no longer join until they are keyed again.
+    """
+    crosswalk = crosswalk.copy()
+    ids = ids.copy()
+
+    # PFR-only players whose GSIS id has now turned up
+    pfr_to_gsis = (
+        pd.concat([crosswalk[['pfr_id', 'gsis_id']], ids[['pfr_id', 'gsis_id']]])
+        .dropna().drop_duplicates('pfr_id').set_index('pfr_id')['gsis_id']
+    )
+    pfr_only = crosswalk['gsis_id'].isna() & crosswalk['pfr_id'].notna()
+    linked = crosswalk.loc[pfr_only, 'pfr_id'].map(pfr_to_gsis).dropna()
+    if len(linked):
+        crosswalk.loc[linked.index, 'gsis_id'] = linked
+        crosswalk = _collapse(crosswalk)
+    ids['gsis_id'] = ids['gsis_id'].fillna(ids['pfr_id'].map(pfr_to_gsis))
+
+    ids['identity'] = _identity(ids)
+    seen = ids.groupby('identity').agg(
+        gsis_id=('gsis_id', 'first'),
+        pfr_id=('pfr_id', 'first'),
+        display_name=('display_name', 'first'),
+        short_name=('short_name', 'first'),
+        first_season=('season', 'min'),
+        last_season=('season', 'max'),
+    )
+
+    existing = crosswalk.set_index(_identity(crosswalk)).drop(columns='player_key')
+    keys = crosswalk.set_index(_identity(crosswalk))['player_key']
+    merged = existing.combine_first(seen)
+    for column, combine in (('first_season', 'min'), ('last_season', 'max')):
+        both = pd.concat([existing[column], seen[column]])
+        merged[column] = both.groupby(level=0).agg(combine)
+
+    new = merged.index.difference(keys.index).sort_values()
+    start = int(keys.max()) + 1 if len(keys) else 0
+    keys = pd.concat([keys, pd.Series(np.arange(start, start + len(new)), index=new)])
+    merged['player_key'] = keys.reindex(merged.index).astype('int32')
+
+    return merged.reset_index(drop=True)[CROSSWALK_COLUMNS].sort_values('player_key', ignore_index=True)
+
+def attach_keys(frame, crosswalk, id_column, id_type='gsis', fallback_column=None,
+                key_column='player_key'):
+    """Add an int32 player_key column by vectorized lookup; unknown players get -1
+
+    id_type says what id_column holds ('gsis' or 'pfr'). fallback_column, a
+    PFR id column, fills in players whose id_column is empty (as in older draft rows).
+    Unknown players all share -1, so filter them out before merging on the key
+    (a nullable <NA> key would not help: pandas merges match missing keys too).
+    """
+    keys = np.full(len(frame), -1, dtype='int32')
+    lookups = [(id_column, f"{id_type}_id")]
+    if fallback_column is not None:
+        lookups.append((fallback_column, 'pfr_id'))
+
+    for column, crosswalk_column in lookups:
+        table = crosswalk.dropna(subset=[crosswalk_column]).drop_duplicates(crosswalk_column)
+        ids = np.asarray(frame[column], dtype=object)
+        positions = pd.Index(table[crosswalk_column]).get_indexer(ids)
+        found = (keys == -1) & (positions >= 0)
+        keys[found] = table['player_key'].to_numpy()[positions[found]]
+
+    return frame.assign(**{key_column: keys})
+
+def read_crosswalk(path):
+    """Return (crosswalk, sources) from disk; sources maps partition keys to the checksums already merged"""
+    try:
+        table = pq.read_table(path)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return empty_crosswalk(), {}
+    metadata = table.schema.metadata or {}
+    if metadata.get(b'version') != CROSSWALK_VERSION.encode():
+        return empty_crosswalk(), {}
+    return table.to_pandas(), json.loads(metadata.get(b'sources', b'{}'))
+
+def write_crosswalk(path, crosswalk, sources):
+    """Store the crosswalk with the partition checksums it was built from"""
+    table = pa.Table.from_pandas(crosswalk, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        'version': CROSSWALK_VERSION,
+        'sources': json.dumps(sources, sort_keys=True),
+    })
+    with atomic_write(path) as f:
+        pq.write_table(table, f)
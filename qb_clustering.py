@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+QB Clustering - Reusable quarterback clustering on top of NFLDataManager
+Fit once, persist the model, and classify new quarterbacks without refitting
+"""
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+# Rate stats from NFLDataManager.get_qb_features that describe playing style
+DEFAULT_FEATURES = [
+    'completion_pct', 'yards_per_attempt', 'air_yards_per_attempt',
+    'td_pct', 'int_pct', 'sack_pct', 'epa_per_play',
+]
+
+DEFAULT_MODEL_PATH = os.path.join('models', 'qb_clusters.joblib')
+
+def _make_estimator(n_clusters, mini_batch, batch_size, random_state, init='k-means++', n_init='auto'):
+    """Build a KMeans or MiniBatchKMeans estimator"""
+    if mini_batch:
+        return MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, init=init,
+                               n_init=n_init, random_state=random_state)
+    return KMeans(n_clusters=n_clusters, init=init, n_init=n_init, random_state=random_state)
+
+class QBClusterModel:
+    """Feature selection, scaling and k-means clustering for quarterback profiles"""
+
+    def __init__(self, n_clusters=4, features=None, mini_batch=False, batch_size=1024, random_state=42):
+        """Configure the model; mini_batch=True uses MiniBatchKMeans for large play-level sets"""
+        self.n_clusters = n_clusters
+        self.features = list(features or DEFAULT_FEATURES)
+        self.mini_batch = mini_batch
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.scaler = None
+        self.estimator = None
+
+    @property
+    def is_fitted(self):
+        return self.estimator is not None and hasattr(self.estimator, 'cluster_centers_')
+
+    def _matrix(self, data):
+        """Return the feature matrix for rows with every feature present, plus their mask"""
+        missing = [feature for feature in self.features if feature not in data.columns]
+        if missing:
+            raise KeyError(f"Missing clustering features: {missing}")
+        values = data[self.features].to_numpy(dtype=float)
+        mask = np.isfinite(values).all(axis=1)
+        return values[mask], mask
+
+    def fit(self, data, warm_start=False):
+        """Fit the scaler and clustering model
+
+        With warm_start=True and an already fitted model, clustering starts
+        from the current centers (and keeps the current scaler), so refits on
+        a season of new data converge in a few iterations and cluster ids stay
+        stable.
+        """
+        values, _ = self._matrix(data)
+        if len(values) < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} complete rows to fit, got {len(values)}")
+
+        if warm_start and self.is_fitted:
+            scaled = self.scaler.transform(values)
+            init = self.estimator.cluster_centers_
+            self.estimator = _make_estimator(self.n_clusters, self.mini_batch, self.batch_size,
+                                             self.random_state, init=init, n_init=1)
+        else:
+            self.scaler = StandardScaler()
+            scaled = self.scaler.fit_transform(values)
+            self.estimator = _make_estimator(self.n_clusters, self.mini_batch, self.batch_size,
+                                             self.random_state)
+
+        self.estimator.fit(scaled)
+        return self
+
+    def fit_scaler(self, chunks):
+        """Fit the scaler over every chunk, as a first pass before partial_fit"""
+        self.scaler = StandardScaler()
+        for chunk in chunks:
+            values, _ = self._matrix(chunk)
+            if len(values):
+                self.scaler.partial_fit(values)
+        return self
+
+    def partial_fit(self, data):
+        """Update a mini-batch model with one chunk, e.g. from NFLDataManager.iter_pbp
+
+        The scaler is frozen while clustering so every chunk, and later
+        predict(), share one scaling. Call fit_scaler() over the chunks first;
+        otherwise the scaler is fitted on the first chunk alone.
+        """
+        if not self.mini_batch:
+            raise ValueError("partial_fit requires mini_batch=True")
+        values, _ = self._matrix(data)
+        if not len(values):
+            return self
+
+        if self.scaler is None:
+            self.scaler = StandardScaler().fit(values)
+        if self.estimator is None:
+            self.estimator = _make_estimator(self.n_clusters, True, self.batch_size, self.random_state)
+        self.estimator.partial_fit(self.scaler.transform(values))
+        return self
+
+    def predict(self, data):
+        """Return cluster labels aligned to data's index (-1 where features are missing)"""
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted; call fit() or QBClusterModel.load() first")
+        values, mask = self._matrix(data)
+        labels = np.full(len(data), -1, dtype=int)
+        if len(values):
+            labels[mask] = self.estimator.predict(self.scaler.transform(values))
+        return pd.Series(labels, index=data.index, name='cluster')
+
+    def classify(self, data):
+        """Return a copy of data with its cluster and distance to that cluster's center"""
+        result = data.copy()
+        result['cluster'] = self.predict(data)
+
+        values, mask = self._matrix(data)
+        distances = np.full(len(data), np.nan)
+        if len(values):
+            distances[mask] = self.estimator.transform(self.scaler.transform(values)).min(axis=1)
+        result['cluster_distance'] = distances
+        return result
+
+    def cluster_profiles(self):
+        """Return cluster centers in original feature units"""
+        centers = self.scaler.inverse_transform(self.estimator.cluster_centers_)
+        profiles = pd.DataFrame(centers, columns=self.features)
+        profiles.index.name = 'cluster'
+        return profiles
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Persist the fitted model so new players can be classified without refitting"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """Load a model saved with save()"""
+        model = joblib.load(path)
+        if not isinstance(model, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return model
+
+def _score_k(values, k, mini_batch, batch_size, random_state, silhouette_sample):
+    """Fit one k and return its inertia and silhouette score"""
+    estimator = _make_estimator(k, mini_batch, batch_size, random_state)
+    labels = estimator.fit_predict(values)
+    sample_size = min(silhouette_sample, len(values)) if silhouette_sample else None
+    silhouette = silhouette_score(values, labels, sample_size=sample_size, random_state=random_state)
+    return {'k': k, 'inertia': estimator.inertia_, 'silhouette': silhouette}
+
+def k_sweep(data, ks=range(2, 11), features=None, mini_batch=False, batch_size=1024,
+            random_state=42, n_jobs=-1, silhouette_sample=10_000):
+    """Score each k in parallel across cores, returning inertia and silhouette per k
+
+    Silhouette is computed on a sample of at most silhouette_sample rows so
+    large play-level feature sets stay tractable.
+    """
+    model = QBClusterModel(features=features)
+    values, _ = model._matrix(data)
+    scaled = StandardScaler().fit_transform(values)
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_score_k)(scaled, k, mini_batch, batch_size, random_state, silhouette_sample)
+        for k in ks
+    )
+    return pd.DataFrame(results).sort_values('k').reset_index(drop=True)
+
+def load_qb_seasons(dm, years, min_attempts=200):
+    """Load cached QB season features with enough attempts to cluster reliably"""
+    seasons = dm.get_qb_features(years, level='season')
+    return seasons[seasons['attempts'] >= min_attempts].reset_index(drop=True)
+
+def main():
+    """Fit QB clusters on recent seasons and classify the latest season"""
+    from nfl_data_manager import NFLDataManager
+
+    print("🏈 QB Clustering")
+    print("=" * 50)
+
+    dm = NFLDataManager()
+    train_years = list(range(2018, 2024))
+    training = load_qb_seasons(dm, train_years)
+
+    print("\n📈 Scoring cluster counts...")
+    sweep = k_sweep(training, ks=range(2, 9))
+    print(sweep.to_string(index=False))
+
+    best_k = int(sweep.loc[sweep['silhouette'].idxmax(), 'k'])
+    model = QBClusterModel(n_clusters=best_k).fit(training)
+    path = model.save()
+    print(f"\n💾 Saved {best_k}-cluster model to: {path}")
+    print(model.cluster_profiles().round(2).to_string())
+
+    new_qbs = load_qb_seasons(dm, [2024])
+    classified = QBClusterModel.load(path).classify(new_qbs)
+    classified.to_csv('new_qbs_classified.csv', index=False)
+    print(f"\n✅ Classified {len(classified)} QB seasons to new_qbs_classified.csv")
+
+if __name__ == "__main__":
+    main()
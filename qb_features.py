@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+QB Feature Tables - Vectorized quarterback aggregates built from weekly data
+Used by NFLDataManager.get_qb_features to materialize season, career and rolling tables
+"""
+
+import pandas as pd
+
+# Counting stats summed across games; any that are missing from the source are skipped
+COUNTING_STATS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions',
+    'sacks', 'sack_yards', 'passing_air_yards', 'passing_yards_after_catch',
+    'passing_first_downs', 'passing_epa', 'carries', 'rushing_yards', 'rushing_tds',
+]
+
+def _safe_ratio(numerator, denominator):
+    """Divide two Series, returning NaN where the denominator is zero"""
+    return numerator / denominator.where(denominator != 0)
+
+def add_rate_stats(table):
+    """Add per-attempt rate stats computed from summed counting stats"""
+    table = table.copy()
+    attempts = table['attempts']
+    dropbacks = attempts + table['sacks'] if 'sacks' in table else attempts
+
+    table['completion_pct'] = _safe_ratio(table['completions'], attempts) * 100
+    table['yards_per_attempt'] = _safe_ratio(table['passing_yards'], attempts)
+    table['td_pct'] = _safe_ratio(table['passing_tds'], attempts) * 100
+    table['int_pct'] = _safe_ratio(table['interceptions'], attempts) * 100
+    if 'passing_epa' in table:
+        table['epa_per_play'] = _safe_ratio(table['passing_epa'], dropbacks)
+    if 'passing_air_yards' in table:
+        table['air_yards_per_attempt'] = _safe_ratio(table['passing_air_yards'], attempts)
+    if 'sacks' in table:
+        table['sack_pct'] = _safe_ratio(table['sacks'], dropbacks) * 100
+    return table
+
+def _counting_columns(frame):
+    return [column for column in COUNTING_STATS if column in frame.columns]
+
+def season_features(weekly):
+    """Aggregate weekly QB rows to one row per player_id and season"""
+    qbs = weekly[weekly['position'] == 'QB'] if 'position' in weekly else weekly
+    stats = _counting_columns(qbs)
+
+    grouped = qbs.sort_values(['season', 'week']).groupby(
+        ['player_id', 'season'], sort=True, observed=True
+    )
+    table = grouped[stats].sum()
+    table['games'] = grouped.size()
+
+    # Latest name and team the player appeared under that season
+    for column in ('player_name', 'recent_team'):
+        if column in qbs:
+            table[column] = grouped[column].last()
+
+    return add_rate_stats(table.reset_index())
+
+def career_features(seasons):
+    """Roll player-season rows up to one row per player_id across the given seasons"""
+    stats = _counting_columns(seasons) + ['games']
+
+    grouped = seasons.sort_values('season').groupby('player_id', sort=True, observed=True)
+    table = grouped[stats].sum()
+    table['seasons'] = grouped.size()
+    table['first_season'] = grouped['season'].min()
+    table['last_season'] = grouped['season'].max()
+    for column in ('player_name', 'recent_team'):
+        if column in seasons:
+            table[column] = grouped[column].last()
+
+    return add_rate_stats(table.reset_index())
+
+def rolling_features(weekly, window):
+    """Trailing window-game sums and rates for each QB game, reset at season boundaries"""
+    qbs = weekly[weekly['position'] == 'QB'] if 'position' in weekly else weekly
+    qbs = qbs.sort_values(['player_id', 'season', 'week']).reset_index(drop=True)
+    stats = _counting_columns(qbs)
+
+    rolled = (
+        qbs.groupby(['player_id', 'season'], sort=False, observed=True)[stats]
+        .rolling(window, min_periods=1)
+        .sum()
+        .reset_index(level=[0, 1], drop=True)
+        .sort_index()
+    )
+    keys = [column for column in ['player_id', 'player_name', 'recent_team', 'season', 'week'] if column in qbs]
+    table = pd.concat([qbs[keys], rolled], axis=1)
+    table['window_games'] = (
+        qbs.groupby(['player_id', 'season'], sort=False, observed=True).cumcount()
+        .clip(upper=window - 1) + 1
+    )
+    return add_rate_stats(table)
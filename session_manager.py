@@ -4,54 +4,81 @@ Day-to-Day NFL Analysis Workflow
 How to efficiently work with NFL data across multiple sessions/projects
 """
 
-import os
 import json
 from datetime import datetime
+from cache_manifest import atomic_write
+from lazy_imports import is_available
+
+CORE_PACKAGES = ['nfl_data_py', 'pandas', 'sklearn']
 
 def check_session_status():
     """Check what's available in current session"""
     print("🔍 Current Session Status Check")
     print("=" * 40)
     
-    # Check if packages are installed
-    try:
-        import nfl_data_py as nfl
-        import pandas as pd
-        import sklearn
+    # Check if packages are installed (find_spec locates them without importing)
+    missing = [name for name in CORE_PACKAGES if not is_available(name)]
+    if not missing:
         print("✅ Core packages: nfl_data_py, pandas, sklearn available")
         packages_ready = True
-    except ImportError as e:
-        print(f"❌ Missing packages: {e}")
+    else:
+        print(f"❌ Missing packages: {', '.join(missing)}")
         packages_ready = False
     
-    # Check for cached data
-    cache_dirs = ['nfl_data_cache', 'datasets']
+    # Scan the cache and workspace (cache coverage comes from its manifest)
+    from workspace_status import workspace_status
+    workspace = workspace_status()
+    cache = workspace['cache']
     cached_data = {}
     
-    for cache_dir in cache_dirs:
-        if os.path.exists(cache_dir):
-            files = os.listdir(cache_dir)
-            total_size = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in files) / (1024*1024)
-            cached_data[cache_dir] = {'files': len(files), 'size_mb': total_size}
-            print(f"✅ {cache_dir}: {len(files)} files ({total_size:.1f} MB)")
-        else:
-            print(f"❌ {cache_dir}: Not found")
+    if cache['exists']:
+        print(f"✅ {cache['dir']}: {cache['files']} files ({cache['bytes'] / (1024*1024):.1f} MB)")
+        for data_type, summary in cache['datasets'].items():
+            cached_data[data_type] = {
+                'seasons': summary['coverage'],
+                'size_mb': round(summary['bytes'] / (1024*1024), 1),
+                'stale': summary['stale'],
+            }
+            print(f"   📊 {data_type}: {summary['coverage']} "
+                  f"({summary['rows']:,} rows, {summary['bytes'] / (1024*1024):.1f} MB)")
+            if summary['gaps']:
+                print(f"      ⚠️  Missing seasons: {', '.join(map(str, summary['gaps']))}")
+            if summary['stale']:
+                print(f"      🔄 Stale, will refresh on next load: {', '.join(map(str, summary['stale']))}")
+        if cache['untracked_bytes']:
+            print(f"   📦 {cache['untracked_bytes'] / (1024*1024):.1f} MB not tracked by the manifest "
+                  f"(indexes, locks, leftovers)")
+        if cache['legacy_files']:
+            print(f"   ⚠️  {len(cache['legacy_files'])} legacy .pkl caches "
+                  f"({cache['legacy_bytes'] / (1024*1024):.1f} MB) are no longer read; "
+                  f"NFLDataManager().prune() removes them")
+        if cache['missing']:
+            print(f"   ❌ {len(cache['missing'])} partitions in the manifest have no file: "
+                  f"{', '.join(cache['missing'][:5])}")
+    else:
+        print(f"❌ {cache['dir']}: Not found")
     
     # Check for previous analysis results
-    analysis_files = ['qb_stats_2018_2024.csv', 'veteran_qbs_clustered.csv']
+    for name, project in workspace['workspace']['projects'].items():
+        print(f"✅ Project {name}: {project['outputs']} outputs"
+              + (f" (last: {project['last_output'].replace('T', ' ')})" if project['last_output'] else ""))
     previous_work = []
-    for file in analysis_files:
-        if os.path.exists(file):
-            mod_time = datetime.fromtimestamp(os.path.getmtime(file))
-            previous_work.append(f"{file} (modified: {mod_time.strftime('%Y-%m-%d %H:%M')})")
-            print(f"✅ Previous work: {file}")
-        else:
-            print(f"❌ Previous work: {file} not found")
+    for result in workspace['workspace']['recent_results']:
+        previous_work.append(f"{result['path']} (modified: {result['modified'].replace('T', ' ')})")
+        print(f"✅ Previous work: {previous_work[-1]}")
+    if not previous_work:
+        print("❌ Previous work: no results found")
+    
+    for error in workspace['errors']:
+        print(f"⚠️  Could not scan {error}")
+    print(f"⏱️  Scanned {cache['files'] + workspace['workspace']['files']:,} files "
+          f"in {workspace['elapsed_seconds']:.2f}s")
     
     return {
         'packages_ready': packages_ready,
         'cached_data': cached_data,
-        'previous_work': previous_work
+        'previous_work': previous_work,
+        'workspace': workspace,
     }
 
 def new_project_workflow():
@@ -90,10 +117,11 @@ def fresh_data_workflow():
     """Download fresh data for new analysis"""
     print("\n🌐 Fresh Data Download")
     print("-" * 30)
-    print("Running: python collect_all_data.py")
-    print("⏱️  This will take 5-10 minutes but gives you latest data")
+    print("Running: python warm_cache.py warm_cache.json")
+    print("⏱️  Only missing or stale seasons are downloaded, several at a time")
     
-    # You would run: python collect_all_data.py
+    import warm_cache
+    warm_cache.main(['warm_cache.json'])
 
 def cached_data_workflow():
     """Use existing cached data"""
@@ -134,14 +162,15 @@ qb_only = qb_data[qb_data['position'] == 'QB']
 
 def save_session_info():
     """Save information about current session for future reference"""
+    status = check_session_status()
+    projects = status['workspace']['workspace']['projects']
     session_info = {
         'timestamp': datetime.now().isoformat(),
-        'status': check_session_status(),
-        'workspace_files': os.listdir('.'),
-        'last_analysis': 'quarterback_clustering_project'
+        'status': status,
+        'last_analysis': max(projects, key=lambda name: projects[name]['last_output'] or '', default=None)
     }
     
-    with open('.session_info.json', 'w') as f:
+    with atomic_write('.session_info.json', 'w') as f:
         json.dump(session_info, f, indent=2)
     
     print("💾 Session info saved to .session_info.json")
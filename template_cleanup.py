@@ -16,6 +16,21 @@ def cleanup_for_template():
         '.devcontainer/',
         '.git/',
         'nfl_data_manager.py',
+        'cache_manifest.py',
+        'cache_bundle.py',
+        'dtype_optimizer.py',
+        'partition_index.py',
+        'cache_query.py',
+        'player_crosswalk.py',
+        'pipeline_stages.py',
+        'workspace_status.py',
+        'qb_features.py',
+        'qb_clustering.py',
+        'instrumentation.py',
+        'lazy_imports.py',
+        'warm_cache.py',
+        'warm_cache.json',
+        'benchmark_data_manager.py',
         'session_manager.py', 
         'new_project.py',
         'requirements.txt',
@@ -97,6 +112,21 @@ def preview_cleanup():
         '.devcontainer/',
         '.git/',
         'nfl_data_manager.py',
+        'cache_manifest.py',
+        'cache_bundle.py',
+        'dtype_optimizer.py',
+        'partition_index.py',
+        'cache_query.py',
+        'player_crosswalk.py',
+        'pipeline_stages.py',
+        'workspace_status.py',
+        'qb_features.py',
+        'qb_clustering.py',
+        'instrumentation.py',
+        'lazy_imports.py',
+        'warm_cache.py',
+        'warm_cache.json',
+        'benchmark_data_manager.py',
         'session_manager.py',
         'new_project.py', 
         'requirements.txt',
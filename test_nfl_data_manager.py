@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+NFLDataManager regression tests - Cache refresh and download paths driven by injected loaders
+No network access: every dataset is served by a loader built here
+"""
+
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+from nfl_data_manager import NFLDataManager, current_season
+
+def weekly_loader(weeks, yards):
+    """Loader returning one QB row per week with the given passing yards"""
+    def load(years):
+        return pd.DataFrame({
+            'season': [year for year in years for _ in weeks],
+            'week': [week for _ in years for week in weeks],
+            'player_id': '00-0000001',
+            'position': 'QB',
+            'passing_yards': float(yards),
+        })
+    return load
+
+def test_refresh_keeps_corrections_to_earlier_weeks(tmp_path):
+    season = current_season()
+    dm = NFLDataManager(tmp_path, loaders={'weekly': weekly_loader([1, 2, 3], 100)},
+                        current_max_age_days=0, memory_cache_bytes=0)
+    dm.get_weekly_data([season])
+
+    # Upstream corrected every week and added week 4
+    dm.loaders['weekly'] = weekly_loader([1, 2, 3, 4], 250)
+    data = dm.get_weekly_data([season])
+
+    assert sorted(data['week']) == [1, 2, 3, 4]
+    assert (data['passing_yards'] == 250).all()
+
+def test_refresh_tops_up_a_partial_download(tmp_path):
+    season = current_season()
+    dm = NFLDataManager(tmp_path, loaders={'weekly': weekly_loader([1, 2, 3], 100)},
+                        current_max_age_days=0, memory_cache_bytes=0)
+    dm.get_weekly_data([season])
+
+    # A loader fetching only the recent weeks keeps the cached rows of the weeks it left out
+    dm.loaders['weekly'] = weekly_loader([3, 4], 250)
+    data = dm.get_weekly_data([season]).sort_values('week')
+
+    assert list(data['week']) == [1, 2, 3, 4]
+    assert list(data['passing_yards']) == [100, 100, 250, 250]
+
+def test_optimized_float_counts_stay_floats(tmp_path):
+    def load(years):
+        return pd.DataFrame({
+            'season': years[0],
+            'week': [1, 2],
+            'attempts': [49.0, 20.0] if years[0] == 2020 else [30.0, float('nan')],
+        })
+    dm = NFLDataManager(tmp_path, loaders={'weekly': load}, optimize_dtypes=True, memory_cache_bytes=0)
+    first = dm.get_weekly_data([2020])
+    both = dm.get_weekly_data([2020, 2021])
+
+    assert (first['attempts'] * 5).max() == 245
+    assert first['attempts'].dtype == both['attempts'].dtype == 'float32'
+
+def draft_loader(log_path, years, delay=0.2):
+    """Draft loader appending each season it downloads to log_path, slow enough for fetches to overlap"""
+    time.sleep(delay)
+    with open(log_path, 'a') as f:
+        f.writelines(f"{year}\n" for year in years)
+        f.flush()
+        pick = f.tell()
+    # Every download differs, as a forced refresh after an upstream change would
+    return pd.DataFrame({'season': years, 'round': 1, 'pick': pick})
+
+def downloads(log_path):
+    """Count downloads per season recorded by draft_loader"""
+    if not os.path.exists(log_path):
+        return {}
+    with open(log_path) as f:
+        return dict(Counter(int(line) for line in f))
+
+def load_draft(data_dir, log_path, max_workers):
+    NFLDataManager(data_dir, loaders={'draft': functools.partial(draft_loader, log_path)},
+                   max_workers=max_workers).get_draft_data([2021, 2022, 2023])
+
+def test_concurrent_threads_download_each_season_once(tmp_path):
+    log_path = tmp_path / 'downloads.log'
+    threads = [
+        threading.Thread(target=load_draft, args=(tmp_path / 'cache', log_path, workers))
+        for workers in (3, 1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert downloads(log_path) == {2021: 1, 2022: 1, 2023: 1}
+
+def test_concurrent_processes_download_each_season_once(tmp_path):
+    log_path = tmp_path / 'downloads.log'
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=load_draft, args=(str(tmp_path / 'cache'), str(log_path), workers))
+        for workers in (3, 1)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+
+    assert [process.exitcode for process in processes] == [0, 0]
+    assert downloads(log_path) == {2021: 1, 2022: 1, 2023: 1}
+
+def test_force_refresh_is_skipped_only_if_another_writer_replaced_the_version(tmp_path):
+    log_path = tmp_path / 'downloads.log'
+    dm = NFLDataManager(tmp_path / 'cache', loaders={'draft': functools.partial(draft_loader, log_path, delay=0)})
+    dm.get_draft_data([2021])
+    replaced = dm._partition_version('draft', 2021)
+
+    dm.get_draft_data([2021], force_refresh=True)
+    assert downloads(log_path) == {2021: 2}
+
+    # A forced fetch still aimed at the version that was just replaced is not repeated
+    dm._fetch_season_once('draft', 2021, replace_version=replaced)
+    assert downloads(log_path) == {2021: 2}
+
+def test_deleted_partition_file_is_downloaded_again(tmp_path):
+    log_path = tmp_path / 'downloads.log'
+    dm = NFLDataManager(tmp_path / 'cache', loaders={'draft': functools.partial(draft_loader, log_path, delay=0)},
+                        memory_cache_bytes=0)
+    dm.get_draft_data([2021])
+    os.remove(dm.get_cache_path('draft', 2021))
+
+    assert len(dm.get_draft_data([2021])) == 1
+    assert downloads(log_path) == {2021: 2}
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Start-up budget - The CLI entry points must import quickly and without pandas/pyarrow
+Each import is timed in a fresh interpreter, so the modules already loaded here do not count
+"""
+
+import pytest
+
+from benchmark_data_manager import STARTUP_MODULES, measure_import_time
+
+# Same default as benchmark_data_manager.py --startup-budget
+STARTUP_BUDGET_S = 0.25
+
+@pytest.mark.parametrize('module', STARTUP_MODULES)
+def test_entry_point_imports_within_budget(module):
+    result = measure_import_time(module, repeat=3)
+    assert result['heavy_imports'] == [], f"import {module} pulled in {result['heavy_imports']}"
+    assert result['import_s'] <= STARTUP_BUDGET_S, (
+        f"import {module} took {result['import_s'] * 1000:.1f} ms "
+        f"(budget {STARTUP_BUDGET_S * 1000:.0f} ms)"
+    )
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Warm Cache - Prime the NFL data cache from a declarative dataset manifest
+Run once on a fresh codespace or CI box; re-run to resume after an interruption
+
+Example:
+    python warm_cache.py warm_cache.json --workers 8
+"""
+
+import argparse
+import logging
+import sys
+
+from nfl_data_manager import NFLDataManager
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Prefetch NFL datasets listed in a JSON/YAML manifest")
+    parser.add_argument('manifest', nargs='?', default='warm_cache.json',
+                        help="Dataset manifest (default: warm_cache.json)")
+    parser.add_argument('--cache-dir', default='nfl_data_cache')
+    parser.add_argument('--workers', type=int, default=4, help="Seasons fetched in parallel")
+    parser.add_argument('--force-refresh', action='store_true', help="Re-download even fresh partitions")
+    parser.add_argument('--dry-run', action='store_true', help="Only report what would be fetched")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    print("🏈 NFL Cache Warm-Up")
+    print("=" * 50)
+
+    dm = NFLDataManager(args.cache_dir, max_workers=args.workers)
+    report = dm.warm(args.manifest, force_refresh=args.force_refresh, dry_run=args.dry_run)
+
+    if args.dry_run:
+        for data_type, season in report['pending']:
+            print(f"   🌐 would fetch {data_type} {season}")
+        return 0
+
+    print(f"\n✅ Fetched: {len(report['fetched'])}, already cached: {report['cached']}, "
+          f"failed: {len(report['failed'])}")
+    if report['failed']:
+        for (data_type, season), error in sorted(report['failed'].items()):
+            print(f"   ❌ {data_type} {season}: {error}")
+        print("💡 Re-run the same command to retry; finished partitions are kept")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Workspace Status - Fast summary of the data cache and the analysis projects around it
+Used by session_manager; cache coverage comes from the manifest, everything else from a parallel os.scandir walk
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from nfl_data_manager import LEGACY_CACHE_SUFFIX, NFLDataManager
+
+# Directories never worth descending into
+SKIP_DIRS = {'.git', '__pycache__', '.ipynb_checkpoints', '.venv', 'venv', 'node_modules'}
+
+# Files reported as previous analysis results
+RESULT_EXTENSIONS = ('.csv', '.png')
+
+SCAN_WORKERS = 8
+
+def _list_dir(path, known_sizes, skip_paths):
+    """List one directory: (files, subdirectories, errors)
+
+    Files are (path, size, mtime). Sizes in known_sizes are taken as given
+    instead of stat-ing the file, and their mtime is left as None.
+    """
+    files, subdirs, errors = [], [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and os.path.abspath(entry.path) not in skip_paths:
+                            subdirs.append(entry.path)
+                        continue
+                    normalized = os.path.normpath(entry.path)
+                    if normalized in known_sizes:
+                        files.append((normalized, known_sizes[normalized], None))
+                    else:
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((normalized, stat.st_size, stat.st_mtime))
+                except OSError as error:  # removed or unreadable mid-scan
+                    errors.append(f"{entry.path}: {error.strerror}")
+    except OSError as error:
+        errors.append(f"{path}: {error.strerror}")
+    return files, subdirs, errors
+
+def scan_trees(roots, known_sizes=None, skip_paths=(), max_workers=SCAN_WORKERS):
+    """Walk several directory trees at once, listing each directory as its own task
+
+    Returns {root: {'files': [(path, size, mtime), ...], 'errors': [...]}}.
+    Subdirectories in SKIP_DIRS or skip_paths are not entered, and
+    unreadable directories are reported as errors rather than raised.
+    """
+    known_sizes = {os.path.normpath(path): size for path, size in (known_sizes or {}).items()}
+    skip_paths = {os.path.abspath(path) for path in skip_paths}
+    results = {root: {'files': [], 'errors': []} for root in roots}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {
+            pool.submit(_list_dir, root, known_sizes, skip_paths): root
+            for root in roots if os.path.isdir(root)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                root = pending.pop(future)
+                files, subdirs, errors = future.result()
+                results[root]['files'].extend(files)
+                results[root]['errors'].extend(errors)
+                for subdir in subdirs:
+                    pending[pool.submit(_list_dir, subdir, known_sizes, skip_paths)] = root
+    return results
+
+def format_seasons(seasons):
+    """Collapse seasons into ranges, e.g. [1999, 2000, 2001, 2005] -> '1999-2001, 2005'"""
+    ranges = []
+    for season in sorted(seasons):
+        if ranges and season == ranges[-1][1] + 1:
+            ranges[-1][1] = season
+        else:
+            ranges.append([season, season])
+    return ', '.join(f"{first}-{last}" if first != last else str(first) for first, last in ranges)
+
+def cache_coverage(manager, entries):
+    """Summarize manifest entries per dataset: seasons, gaps, stale seasons, rows and bytes"""
+    datasets = {}
+    for entry in entries.values():
+        summary = datasets.setdefault(entry['data_type'], {
+            'seasons': [], 'stale': [], 'formats': set(), 'rows': 0, 'bytes': 0, 'last_written': '',
+        })
+        summary['seasons'].append(entry['season'])
+        summary['formats'].add(entry['format'])
+        summary['rows'] += entry['rows']
+        summary['bytes'] += entry['bytes']
+        summary['last_written'] = max(summary['last_written'], entry['written_at'])
+        if not manager.is_entry_fresh(entry):
+            summary['stale'].append(entry['season'])
+
+    for summary in datasets.values():
+        seasons = sorted(summary['seasons'])
+        summary['seasons'] = seasons
+        summary['stale'] = sorted(summary['stale'])
+        summary['formats'] = sorted(summary['formats'])
+        summary['coverage'] = format_seasons(seasons)
+        summary['gaps'] = sorted(set(range(seasons[0], seasons[-1] + 1)) - set(seasons))
+    return dict(sorted(datasets.items()))
+
+def _is_project(path):
+    """A directory laid out by new_project.py"""
+    return os.path.isfile(os.path.join(path, 'analysis.py')) and os.path.isdir(os.path.join(path, 'outputs'))
+
+def workspace_status(workspace='.', cache_dir='nfl_data_cache', recent=5, max_workers=SCAN_WORKERS):
+    """Scan the cache and the workspace around it in one parallel pass
+
+    Cache partitions are sized from the manifest rather than stat'd, so only
+    the files it does not track (indexes, locks, schemas) cost a stat call.
+    Partitions the manifest lists but the scan did not find are reported
+    as missing. Returns a JSON-serializable dict.
+    """
+    started = time.perf_counter()
+    cache_exists = os.path.isdir(cache_dir)
+    manager = NFLDataManager(data_dir=cache_dir) if cache_exists else None
+    entries = manager.manifest.entries() if manager else {}
+    tracked = {
+        os.path.normpath(os.path.join(cache_dir, entry['path'])): entry['bytes'] for entry in entries.values()
+    }
+
+    scans = scan_trees([cache_dir, workspace], known_sizes=tracked, skip_paths=[cache_dir],
+                       max_workers=max_workers)
+    cache_files, workspace_files = scans[cache_dir]['files'], scans[workspace]['files']
+
+    found = {path for path, _, _ in cache_files}
+    legacy = [
+        (path, size) for path, size, _ in cache_files
+        if os.path.dirname(path) == os.path.normpath(cache_dir) and path.endswith(LEGACY_CACHE_SUFFIX)
+    ]
+    cache_bytes = sum(size for _, size, _ in cache_files)
+    tracked_bytes = sum(size for path, size in tracked.items() if path in found)
+    cache = {
+        'dir': cache_dir,
+        'exists': cache_exists,
+        'files': len(cache_files),
+        'bytes': cache_bytes,
+        'untracked_bytes': cache_bytes - tracked_bytes,
+        'legacy_files': sorted(os.path.basename(path) for path, _ in legacy),
+        'legacy_bytes': sum(size for _, size in legacy),
+        'missing': sorted(
+            key for key, entry in entries.items()
+            if os.path.normpath(os.path.join(cache_dir, entry['path'])) not in found
+        ),
+        'datasets': cache_coverage(manager, entries) if manager else {},
+    }
+
+    relative = [(os.path.relpath(path, workspace).split(os.sep), size, mtime)
+                for path, size, mtime in workspace_files]
+    directories = {}
+    for parts, size, _ in relative:
+        if len(parts) > 1:
+            top = directories.setdefault(parts[0], {'files': 0, 'bytes': 0})
+            top['files'] += 1
+            top['bytes'] += size
+
+    # Projects live wherever analysis.py sits next to outputs/ (new_project.py uses projects/<name>/)
+    projects = {
+        os.path.dirname(os.path.join(*parts)): {'outputs': 0, 'last_output': None}
+        for parts, _, _ in relative
+        if parts[-1] == 'analysis.py' and _is_project(os.path.join(workspace, *parts[:-1]))
+    }
+    for parts, _, mtime in relative:
+        if parts[-1].startswith('.'):  # bookkeeping such as outputs/.run_state.json
+            continue
+        for depth, part in enumerate(parts[:-1]):
+            project = projects.get(os.path.join(*parts[:depth]) if depth else '')
+            if part == 'outputs' and project is not None:
+                project['outputs'] += 1
+                project['last_output'] = max(project['last_output'] or mtime, mtime)
+                break
+
+    results = sorted(
+        (item for item in workspace_files if item[0].endswith(RESULT_EXTENSIONS)),
+        key=lambda item: item[2], reverse=True,
+    )[:recent]
+
+    def timestamp(mtime):
+        return datetime.fromtimestamp(mtime).isoformat(timespec='seconds')
+
+    return {
+        'scanned_at': datetime.now().isoformat(timespec='seconds'),
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'cache': cache,
+        'workspace': {
+            'root': os.path.abspath(workspace),
+            'files': len(workspace_files),
+            'bytes': sum(size for _, size, _ in workspace_files),
+            'directories': dict(sorted(directories.items())),
+            'projects': {
+                path or os.path.basename(os.path.abspath(workspace)): {
+                    **project, 'last_output': project['last_output'] and timestamp(project['last_output'])
+                }
+                for path, project in sorted(projects.items())
+            },
+            'recent_results': [
+                {'path': os.path.relpath(path, workspace), 'modified': timestamp(mtime)}
+                for path, _, mtime in results
+            ],
+        },
+        'errors': scans[cache_dir]['errors'] + scans[workspace]['errors'],
+    }